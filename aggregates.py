@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+
+# --- KUBUS AGREGAT ---
+# Satu baris per kombinasi dimensi; halaman Home dan EDA cukup menjumlahkan baris kubus
+# (jumlah kelompok) alih-alih menghitung ulang dari seluruh baris data setiap rerun.
+CUBE_KEYS = ['program_nama', 'Tahun', 'Kota', 'Kat. Subprogram', 'Sumber Anggaran', 'Cluster']
+
+# Batas kelas histogram Durasi Total (hari), batas kiri inklusif
+DURASI_BINS = [0, 7, 14, 30, 60, 90, 180, 365, np.inf]
+DURASI_LABELS = [f"durasi_{lo:g}_{hi:g}" for lo, hi in zip(DURASI_BINS[:-1], DURASI_BINS[1:])]
+
+# Kolom data mentah yang dibutuhkan untuk membangun kubus (program_nama ditambahkan oleh DataStore)
+CUBE_COLUMNS = [key for key in CUBE_KEYS if key != 'program_nama'] + ['Jumlah Bantuan', 'Durasi Total']
+
+# Kolom yang bersifat aditif sehingga boleh dijumlahkan antar baris kubus
+CUBE_VALUES = [
+    'jumlah', 'bantuan_n', 'bantuan_sum', 'bantuan_sumsq', 'durasi_n', 'durasi_sum',
+] + DURASI_LABELS
+
+
+def build_cube(df):
+    """Membangun kubus agregat (count, sum, sum kuadrat, histogram durasi) dari data mentah."""
+    keys = [key for key in CUBE_KEYS if key in df.columns]
+    bantuan = df['Jumlah Bantuan'].astype('float64')
+    durasi = df['Durasi Total'].astype('float64')
+    values = pd.DataFrame({
+        'jumlah': 1,
+        'bantuan_n': bantuan.notna().astype('int64'),
+        'bantuan_sum': bantuan.fillna(0),
+        'bantuan_sumsq': bantuan.fillna(0) ** 2,
+        'durasi_n': durasi.notna().astype('int64'),
+        'durasi_sum': durasi.fillna(0),
+    }, index=df.index)
+    durasi_bin = pd.cut(durasi, DURASI_BINS, right=False, labels=DURASI_LABELS)
+    values = values.join(pd.get_dummies(durasi_bin, dtype='int64'))
+
+    # dropna=False agar baris dengan dimensi kosong tetap ikut dihitung pada total
+    cube = values.groupby([df[key] for key in keys], observed=True, dropna=False, sort=False).sum()
+    return cube.reset_index()
+
+
+def merge_cubes(cubes):
+    """Menggabungkan beberapa kubus (misal kubus lama + kubus baris baru) menjadi satu kubus."""
+    cube = pd.concat(cubes, ignore_index=True)
+    keys = [key for key in CUBE_KEYS if key in cube.columns]
+    return cube.groupby(keys, observed=True, dropna=False, sort=False)[CUBE_VALUES].sum().reset_index()
+
+
+def summarize_cube(cube, by, sort=True):
+    """Menjumlahkan kubus per kolom `by` lalu menurunkan rata-rata dan simpangan baku."""
+    summary = cube.groupby(by, observed=True, sort=sort)[CUBE_VALUES].sum()
+    summary['bantuan_mean'] = summary['bantuan_sum'] / summary['bantuan_n']
+    # Simpangan baku sampel dari sum dan sum kuadrat (sama seperti Series.std)
+    variance = (summary['bantuan_sumsq'] - summary['bantuan_n'] * summary['bantuan_mean'] ** 2) / (summary['bantuan_n'] - 1)
+    summary['bantuan_std'] = np.sqrt(variance.clip(lower=0))
+    summary['durasi_mean'] = summary['durasi_sum'] / summary['durasi_n']
+    return summary
+
+
+def cube_totals(cube):
+    """Total satu baris (jumlah transaksi, total bantuan, rata-rata durasi) untuk seluruh kubus."""
+    totals = cube[CUBE_VALUES].sum()
+    return {
+        'jumlah': int(totals['jumlah']),
+        'bantuan_sum': totals['bantuan_sum'],
+        'durasi_mean': totals['durasi_sum'] / totals['durasi_n'] if totals['durasi_n'] else float('nan'),
+    }
+
+
+# --- PROFIL CLUSTER ---
+# Kolom yang diringkas pada halaman Profiling Cluster
+PROFILE_COLUMNS = ['Jumlah Bantuan', 'Durasi Total', 'Kota', 'Kat. Subprogram', 'Sumber Anggaran']
+PROFILE_KEYS = ['Cluster', 'Tahun']
+# Kolom data mentah yang dibutuhkan untuk membangun ClusterProfile
+PROFILE_SOURCE_COLUMNS = PROFILE_KEYS + PROFILE_COLUMNS
+
+
+class ClusterProfile:
+    """Distribusi nilai setiap kolom profil untuk semua cluster dan tahun, dihitung sekali dengan groupby.
+
+    Ringkasan, Top-N, dan posisi baris satu cluster pada satu tahun (atau semua tahun) cukup diambil dari
+    kamus hasil perhitungan, tanpa memfilter atau menyalin baris data setiap kali pilihan cluster/tahun berubah.
+    """
+
+    def __init__(self, df):
+        keys = [df[key] for key in PROFILE_KEYS]
+        positions = pd.Series(np.arange(len(df)), index=df.index)
+        # (kolom, cluster, tahun) -> value_counts; tahun None berarti semua tahun
+        self._counts = {}
+        for col in PROFILE_COLUMNS:
+            # Jumlah baris dan posisi baris pertama setiap nilai; dropna=False agar baris tanpa Tahun tetap masuk
+            # "Semua Tahun", nilai kosong dibuang seperti value_counts
+            counts = positions.groupby(keys + [df[col]], observed=True, dropna=False, sort=False).agg(['size', 'min'])
+            counts = counts[counts.index.get_level_values(col).notna()]
+            self._add_counts(col, counts, PROFILE_KEYS)
+            per_cluster = counts.groupby(level=['Cluster', col], observed=True).agg({'size': 'sum', 'min': 'min'})
+            self._add_counts(col, per_cluster, ['Cluster'])
+
+        self._rows = df.groupby(keys, dropna=False, sort=False).indices
+        self._rows.update({(cluster, None): rows for cluster, rows in df.groupby('Cluster', sort=False).indices.items()})
+        self.clusters = sorted({cluster for cluster, _ in self._rows if pd.notna(cluster)})
+        self.years = sorted({int(year) for _, year in self._rows if year is not None and pd.notna(year)})
+
+    def _add_counts(self, col, counts, keys):
+        """Menyimpan value_counts setiap kelompok `keys` dari satu tabel frekuensi gabungan (kolom size dan min)."""
+        counts = counts[counts['size'] > 0]
+        if counts.empty:
+            return
+        index, size = counts.index, counts['size'].to_numpy()
+        codes = [index.codes[index.names.index(key)] for key in keys]
+        # Diurutkan sekali untuk semua kelompok: frekuensi terbesar dulu; frekuensi sama urut menurut kemunculan
+        # pertamanya di data (posisi baris terkecil), sama seperti value_counts pada baris kelompok itu
+        order = np.lexsort([counts['min'].to_numpy(), -size] + codes[::-1])
+        values = pd.Series(size[order], index=index.get_level_values(col)[order], name='count')
+        group_codes = np.column_stack([code[order] for code in codes])
+        starts = np.flatnonzero(np.r_[True, (group_codes[1:] != group_codes[:-1]).any(axis=1)])
+        group_keys = [index.get_level_values(key)[order][starts].tolist() for key in keys]
+        for start, stop, key in zip(starts, np.r_[starts[1:], len(order)], zip(*group_keys)):
+            cluster, year = key if len(keys) == 2 else (key[0], None)
+            self._counts[col, cluster, year] = values.iloc[start:stop]
+
+    def rows(self, cluster, year=None):
+        """Posisi baris (terurut) milik satu cluster pada satu tahun, atau semua tahun bila year None."""
+        return self._rows.get((cluster, year), np.array([], dtype=np.int64))
+
+    def value_counts(self, col, cluster, year=None):
+        """Sama dengan df_cluster[col].value_counts() untuk cluster (dan tahun) terpilih."""
+        counts = self._counts.get((col, cluster, year))
+        if counts is None:
+            return pd.Series(dtype='int64', name='count')
+        return counts
+
+    def summary(self, cluster, year=None):
+        """DataFrame ringkasan statistik satu cluster (median, kota/subprogram/sumber anggaran dominan)."""
+        if not len(self.rows(cluster, year)):
+            return pd.DataFrame()
+        counts = {col: self.value_counts(col, cluster, year) for col in PROFILE_COLUMNS}
+        kota_dist = _share(counts['Kota']).nlargest(2)
+        kota_summary = ", ".join([f"{idx} ({val:.1%})" for idx, val in kota_dist.items()]) if not kota_dist.empty else "N/A"
+        sub_dist = _share(counts['Kat. Subprogram']).nlargest(2)
+        sub_summary = ", ".join([f"{idx} ({val:.1%})" for idx, val in sub_dist.items()]) if not sub_dist.empty else "N/A"
+        angg_dist = _share(counts['Sumber Anggaran'])
+        angg_summary = ", ".join([f"{idx} ({val:.1%})" for idx, val in angg_dist.items()]) if not angg_dist.empty else "N/A"
+        summary_data = {
+            "Metrik": ["Median Jumlah Bantuan", "Median Durasi Total", "Kota Dominan (Top 2)", "Subprogram Dominan (Top 2)", "Sumber Anggaran Dominan"],
+            "Nilai": [f"Rp {_median(counts['Jumlah Bantuan']):,.0f}", f"{_median(counts['Durasi Total']):.0f} Hari",
+                      kota_summary, sub_summary, angg_summary]
+        }
+        return pd.DataFrame(summary_data).set_index('Metrik')
+
+    def comparison(self, names, year=None):
+        """Ringkasan cluster-cluster pada `names` (kode -> nama) berdampingan, satu kolom per cluster."""
+        columns = {}
+        for cluster, name in names.items():
+            bantuan = self.value_counts('Jumlah Bantuan', cluster, year)
+            summary = self.summary(cluster, year)
+            if summary.empty:
+                continue
+            totals = pd.Series({
+                "Jumlah Transaksi": f"{len(self.rows(cluster, year))} Kali",
+                "Total Bantuan": f"Rp {(bantuan.index.to_numpy(dtype='float64') * bantuan.to_numpy()).sum():,.0f}",
+            })
+            columns[name] = pd.concat([totals, summary['Nilai']])
+        return pd.DataFrame(columns)
+
+
+def _share(counts):
+    """Proporsi tiap nilai (sama dengan value_counts(normalize=True))."""
+    return counts / counts.sum()
+
+
+def _median(counts):
+    """Median dari tabel frekuensi (nilai -> jumlah), sama dengan Series.median pada baris aslinya."""
+    if counts.empty:
+        return float('nan')
+    counts = counts.sort_index()
+    values = counts.index.to_numpy(dtype='float64')
+    cumulative = counts.to_numpy().cumsum()
+    n = cumulative[-1]
+    lower = values[np.searchsorted(cumulative, (n - 1) // 2, side='right')]
+    upper = values[np.searchsorted(cumulative, n // 2, side='right')]
+    return (lower + upper) / 2
@@ -1,78 +1,179 @@
+import io
+import math
+
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import numpy as np
+
+from aggregates import cube_totals, summarize_cube
+from csv_validation import CsvValidationError
+from data_store import DATA_FILES, DataStore
+from figure_cache import FigureCache
+from profiling import PROFILE_QUERY_PARAM, RerunProfiler, env_enabled
 
 # --- Palet Warna Kustom ---
 # Palet warna brand YDSF (warna terang dihilangkan agar kontras)
 YDSF_PALETTE = ["#0c58a4", "#4ab23a", "#84bd8f", "#84a4cc"]
-# Palet warna dengan kontras tinggi untuk grafik yang membandingkan banyak kategori
-HIGH_CONTRAST_PALETTE = px.colors.qualitative.Plotly
 
 # Konfigurasi halaman agar menggunakan layout lebar dan sidebar tertutup di awal
 st.set_page_config(layout="wide", page_title="Dashboard YDSF Surabaya", initial_sidebar_state="collapsed")
 
-# --- DATA LOADING ---
-DATA_FILES = {
-    "Dakwah": "data/program_dakwah.csv",
-    "Kemanusiaan": "data/program_kemanusiaan.csv",
-    "Masjid": "data/program_masjid.csv",
-    "Pendidikan": "data/program_pendidikan.csv",
-    "Zakat": "data/program_zakat.csv",
-    "Yatim": "data/program_yatim.csv",
-}
+# --- INSTRUMENTASI (OPSIONAL) ---
+def profiling_enabled():
+    """Mode instrumentasi aktif lewat variabel lingkungan YDSF_PROFILE=1 atau parameter URL ?debug=1."""
+    if env_enabled():
+        return True
+    return st.query_params.get(PROFILE_QUERY_PARAM) == "1"
+
+# Dibuat ulang setiap rerun; tanpa mode instrumentasi semua pencatatan diabaikan
+profiler = RerunProfiler(enabled=profiling_enabled())
 
 # --- FUNGSI-FUNGSI BANTU ---
-try:
-    cache_decorator = st.cache_data
-except AttributeError:
-    cache_decorator = st.cache(allow_output_mutation=True)
-
-@cache_decorator
-def load_single_data(program_name):
-    """Fungsi untuk memuat data SATU program."""
-    df = pd.read_csv(DATA_FILES[program_name], sep=';', encoding='latin1')
-    df['Jumlah Bantuan'] = pd.to_numeric(df['Jumlah Bantuan'], errors='coerce')
-    df['Durasi Total'] = pd.to_numeric(df['Durasi Total'], errors='coerce')
-    return df
-
-@cache_decorator
+# Objek bersama (tidak disalin setiap rerun) memakai cache_resource
+@st.cache_resource
+def get_data_store():
+    """Satu DataStore per proses, dipakai bersama oleh semua halaman dan sesi."""
+    return DataStore()
+
+def load_single_data(program_name, columns=None):
+    """Fungsi untuk memuat data SATU program (dari cache kolumnar bila tersedia); hanya kolom `columns` bila diisi."""
+    store = get_data_store()
+    profiler.cache_event("load_single_data", store.is_loaded(program_name))
+    try:
+        with profiler.section(f"data: load_single_data({program_name})"):
+            return store.get(program_name, columns)
+    except FileNotFoundError as e:
+        st.error(f"File tidak ditemukan: {e.filename}.")
+    except CsvValidationError as e:
+        st.error(f"File data tidak valid: {e}")
+    st.stop()
+
 def load_all_data():
     """Fungsi untuk memuat dan menggabungkan SEMUA data program."""
-    list_of_dfs = []
-    for program, file_path in DATA_FILES.items():
-        try:
-            df = pd.read_csv(file_path, sep=';', encoding='latin1')
-            df['program_nama'] = program
-            list_of_dfs.append(df)
-        except FileNotFoundError:
-            st.error(f"File tidak ditemukan: {file_path}.")
-            return pd.DataFrame()
-    
-    if not list_of_dfs:
+    store = get_data_store()
+    profiler.cache_event("load_all_data", store.is_loaded())
+    try:
+        with profiler.section("data: load_all_data"):
+            return store.combined()
+    except FileNotFoundError as e:
+        st.error(f"File tidak ditemukan: {e.filename}.")
+        return pd.DataFrame()
+    except CsvValidationError as e:
+        st.error(f"File data tidak valid: {e}")
         return pd.DataFrame()
 
-    combined_df = pd.concat(list_of_dfs, ignore_index=True)
-    combined_df['Jumlah Bantuan'] = pd.to_numeric(combined_df['Jumlah Bantuan'], errors='coerce')
-    combined_df['Durasi Total'] = pd.to_numeric(combined_df['Durasi Total'], errors='coerce')
-    return combined_df
+# Kubus dan profil cluster hanya membaca kolom yang dibutuhkannya (CUBE_COLUMNS/PROFILE_SOURCE_COLUMNS di
+# aggregates.py); data lengkap (termasuk nama dan KTP/SIM) baru dimuat oleh halaman yang menampilkan tabel penerima.
+def load_cube(program_name=None):
+    """Kubus agregat yang sudah dihitung sekali saat data dimuat (lihat aggregates.py)."""
+    try:
+        with profiler.section(f"data: load_cube({program_name or 'semua'})"):
+            return get_data_store().cube(program_name)
+    except FileNotFoundError as e:
+        st.error(f"File tidak ditemukan: {e.filename}.")
+    except CsvValidationError as e:
+        st.error(f"File data tidak valid: {e}")
+    st.stop()
 
-def generate_cluster_summary_df(df_cluster):
-    """Membuat DataFrame ringkasan statistik untuk satu cluster."""
-    if df_cluster.empty:
-        return pd.DataFrame()
-    median_bantuan = f"Rp {df_cluster['Jumlah Bantuan'].median():,.0f}"
-    median_durasi = f"{df_cluster['Durasi Total'].median():.0f} Hari"
-    kota_dist = df_cluster['Kota'].value_counts(normalize=True).nlargest(2)
-    kota_summary = ", ".join([f"{idx} ({val:.1%})" for idx, val in kota_dist.items()]) if not kota_dist.empty else "N/A"
-    sub_dist = df_cluster['Kat. Subprogram'].value_counts(normalize=True).nlargest(2)
-    sub_summary = ", ".join([f"{idx} ({val:.1%})" for idx, val in sub_dist.items()]) if not sub_dist.empty else "N/A"
-    angg_dist = df_cluster['Sumber Anggaran'].value_counts(normalize=True)
-    angg_summary = ", ".join([f"{idx} ({val:.1%})" for idx, val in angg_dist.items()]) if not angg_dist.empty else "N/A"
-    summary_data = {
-        "Metrik": ["Median Jumlah Bantuan", "Median Durasi Total", "Kota Dominan (Top 2)", "Subprogram Dominan (Top 2)", "Sumber Anggaran Dominan"],
-        "Nilai": [median_bantuan, median_durasi, kota_summary, sub_summary, angg_summary]
-    }
-    return pd.DataFrame(summary_data).set_index('Metrik')
+def load_cluster_profile(program_name):
+    """Profil semua cluster dan tahun satu program; ganti cluster/tahun cukup membaca dari profil ini."""
+    try:
+        with profiler.section(f"data: load_cluster_profile({program_name})"):
+            return get_data_store().cluster_profile(program_name)
+    except FileNotFoundError as e:
+        st.error(f"File tidak ditemukan: {e.filename}.")
+    except CsvValidationError as e:
+        st.error(f"File data tidak valid: {e}")
+    st.stop()
+
+def search_rows(program_name, query):
+    """Posisi baris data program yang Nama Penerima atau KTP/SIM-nya mengandung kata kunci."""
+    with profiler.section(f"search: {program_name}"):
+        return get_data_store().search_index(program_name).search(query)
+
+def lookup_recipient(query):
+    """Posisi baris data gabungan dengan KTP/SIM atau NIDS yang sama persis dengan kata kunci."""
+    with profiler.section("search: lintas program"):
+        return get_data_store().recipient_index().lookup(query)
+
+def load_duplicate_recipients():
+    """KTP/SIM yang tercatat sebagai penerima di lebih dari satu program."""
+    return get_data_store().recipient_index().duplicates
+
+def plotly_express():
+    """plotly.express diimpor saat grafik pertama dibangun, bukan saat skrip dimulai (grafik dari cache tidak memerlukannya)."""
+    import plotly.express as px
+    return px
+
+@st.cache_resource
+def get_figure_cache():
+    """Satu cache grafik per proses, dipakai bersama oleh semua sesi."""
+    return FigureCache()
+
+def cached_figure(page, chart, build, program=None, year=None, cluster=None, city=None):
+    """Mengambil grafik (dan nilai insight-nya) dari cache; build() hanya dijalankan bila filternya belum pernah dibuat."""
+    key = (page, chart, program, year, cluster, city, get_data_store().version)
+    built = []
+    def timed_build():
+        built.append(True)
+        with profiler.section(f"figure: {chart}"):
+            return build()
+    result = get_figure_cache().get_or_build(key, timed_build)
+    profiler.cache_event("figure_cache", not built)
+    return result
+
+def show_chart(fig, chart):
+    """st.plotly_chart dengan pencatatan waktu serialisasi/render per grafik."""
+    with profiler.section(f"render: {chart}"):
+        st.plotly_chart(fig, width="stretch")
+
+# Pilihan jumlah baris per halaman untuk tabel penerima
+PAGE_SIZES = [25, 50, 100, 250]
+
+def export_csv(df, columns, chunk_size=10_000):
+    """Menulis data ke CSV per potongan baris, tanpa membuat satu salinan teks utuh sekaligus."""
+    buffer = io.BytesIO()
+    for start in range(0, max(len(df), 1), chunk_size):
+        df.iloc[start:start + chunk_size][columns].to_csv(buffer, sep=';', index=False, header=start == 0, encoding='utf-8')
+    return buffer.getvalue()
+
+def render_paginated_table(df, key, file_name, program, rows=None, hidden_columns=('Cluster',)):
+    """Menampilkan tabel per halaman: pengurutan dan pemotongan dilakukan di server, hanya satu halaman dikirim ke browser.
+
+    `df` adalah data lengkap satu program dan `rows` posisi baris (terurut) hasil filter, None berarti semua baris.
+    Filter dan pengurutan hanya bekerja pada larik posisi; baris data baru diambil untuk halaman yang ditampilkan.
+    """
+    columns = [col for col in df.columns if col not in hidden_columns]
+    total_rows = len(df) if rows is None else len(rows)
+
+    c1, c2, c3, c4 = st.columns([2, 1, 1, 1])
+    sort_column = c1.selectbox("Urutkan berdasarkan:", options=["(Urutan data)"] + columns, key=f"{key}_sort")
+    ascending = c2.radio("Urutan:", options=["Naik", "Turun"], horizontal=True, key=f"{key}_asc") == "Naik"
+    page_size = c3.selectbox("Baris per halaman:", options=PAGE_SIZES, key=f"{key}_size")
+    total_pages = max(1, math.ceil(total_rows / page_size))
+    # Nomor halaman dibatasi manual karena jumlah halaman berubah mengikuti filter
+    page = min(int(c4.number_input(f"Halaman (dari {total_pages}):", min_value=1, value=1, step=1, key=f"{key}_page")), total_pages)
+
+    start = (page - 1) * page_size
+    stop = min(start + page_size, total_rows)
+    if sort_column == "(Urutan data)":
+        page_rows = np.arange(start, stop) if rows is None else rows[start:stop]
+    else:
+        # Urutan seluruh baris program dihitung sekali per kolom; filter cukup menyaring larik posisi itu
+        order = get_data_store().sort_order(program, sort_column, ascending)
+        if rows is not None:
+            selected = np.zeros(len(df), dtype=bool)
+            selected[rows] = True
+            order = order[selected[order]]
+        page_rows = order[start:stop]
+    df_page = df.iloc[page_rows]
+
+    with profiler.section(f"render: tabel {key}"):
+        st.dataframe(df_page[columns])
+    st.caption(f"Menampilkan baris {start + 1 if total_rows else 0}–{stop} dari {total_rows} data.")
+    # Data CSV baru dibuat ketika tombol diklik
+    st.download_button("Unduh CSV Hasil Filter", data=lambda: export_csv(df if rows is None else df.iloc[rows], columns), file_name=file_name,
+                       mime="text/csv", key=f"{key}_download")
 
 
 # --- KUSTOMISASI UNTUK CLUSTERING ---
@@ -85,6 +186,14 @@ CLUSTER_INFO = {
     "Yatim": {"nama_cluster": {0: "Cluster 0: Beasiswa Panti Asuhan dengan Penyaluran Kilat", 1: "Cluster 1: Beasiswa Non-Panti dengan Proses Lambat", 2: "Cluster 2: Beasiswa SD Non-Panti dengan Penyaluran Cepat"},"penjelasan": "Penamaan cluster didasarkan pada variabel paling signifikan, yaitu **Durasi Total** dan **Kat. Subprogram**."}
 }
 
+# Data baru di data/delta/ ikut dimuat tanpa restart (dicek paling sering sekali per REFRESH_INTERVAL)
+try:
+    get_data_store().refresh()
+except FileNotFoundError as e:
+    st.error(f"File tidak ditemukan: {e.filename}.")
+except CsvValidationError as e:
+    st.error(f"File data tidak valid: {e}")
+
 # --- SIDEBAR ---
 with st.sidebar:
     col1, col2 = st.columns(2)
@@ -94,13 +203,14 @@ with st.sidebar:
         st.image("assets/logo_stakeholder.png", width=60) 
 
     st.title("Navigasi & Filter")
-    selected_page = st.radio("Pilih Halaman:", options=["Home", "Data Penerima Bantuan", "Analisis Eksploratif (EDA)", "Profiling Cluster"])
+    selected_page = st.radio("Pilih Halaman:", options=["Home", "Data Penerima Bantuan", "Pencarian Lintas Program", "Analisis Eksploratif (EDA)", "Profiling Cluster"])
 
     selected_program = None
-    if selected_page != "Home":
+    if selected_page not in ("Home", "Pencarian Lintas Program"):
         selected_program = st.selectbox("Pilih Program untuk Detail:", options=list(DATA_FILES.keys()))
         
     st.markdown("---")
+    profiler.page = selected_page if selected_program is None else f"{selected_page} - {selected_program}"
     st.markdown("<p style='font-size:11px; color:grey;'>Dibuat oleh:<br><b>Ni Luh Ayu - Mahasiswa Sains Data Terapan - PENS</b></p>", unsafe_allow_html=True)
 
 
@@ -115,23 +225,26 @@ if selected_page == "Home":
     st.header("Ringkasan Eksekutif Lintas Program")
     st.write("Halaman ini menyajikan gambaran umum dari seluruh program bantuan YDSF dari tahun 2018 hingga Agustus 2025.")
     
-    df_all = load_all_data()
+    # Home cukup memakai kubus agregat; data mentah (nama, KTP/SIM) tidak dimuat sama sekali
+    cube_all = load_cube()
 
-    if not df_all.empty:
+    if not cube_all.empty:
         st.subheader("Ringkasan Kinerja Lintas Program")
         col1, col2 = st.columns(2)
         with col1:
             st.info("**Total Bantuan yang Disalurkan per Program**")
-            total_per_program = df_all.groupby('program_nama')['Jumlah Bantuan'].sum().sort_values(ascending=False)
-            avg_bantuan_program = total_per_program.mean()
-            # REVISI WARNA: Menggunakan warna spesifik dari palet
-            fig1 = px.bar(total_per_program, y='Jumlah Bantuan', text_auto='.2s', labels={'program_nama':'Program', 'y':'Total Bantuan (Rp)'},
-                          color_discrete_sequence=[YDSF_PALETTE[0]])
-            fig1.add_hline(y=avg_bantuan_program, line_dash="dash", line_color="red", annotation_text="Rata-rata")
-            fig1.update_layout(dragmode=False)
-            st.plotly_chart(fig1, use_container_width=True)
-            program_terbesar = total_per_program.index[0]
-            nilai_terbesar = total_per_program.iloc[0]
+            def build_total_per_program():
+                px = plotly_express()
+                total_per_program = summarize_cube(cube_all, 'program_nama')['bantuan_sum'].rename('Jumlah Bantuan').sort_values(ascending=False)
+                avg_bantuan_program = total_per_program.mean()
+                # REVISI WARNA: Menggunakan warna spesifik dari palet
+                fig1 = px.bar(total_per_program, y='Jumlah Bantuan', text_auto='.2s', labels={'program_nama':'Program', 'y':'Total Bantuan (Rp)'},
+                              color_discrete_sequence=[YDSF_PALETTE[0]])
+                fig1.add_hline(y=avg_bantuan_program, line_dash="dash", line_color="red", annotation_text="Rata-rata")
+                fig1.update_layout(dragmode=False)
+                return fig1, total_per_program.index[0], total_per_program.iloc[0]
+            fig1, program_terbesar, nilai_terbesar = cached_figure("Home", "total_per_program", build_total_per_program)
+            show_chart(fig1, "total_per_program")
             st.markdown(f"""
             <div style='text-align: justify; font-size: 14px;'>
             <b>Analisis:</b> Grafik ini menunjukkan fokus alokasi dana YDSF antar program.<br>
@@ -140,16 +253,18 @@ if selected_page == "Home":
             
         with col2:
             st.info("**Efisiensi Proses Antar Program**")
-            durasi_per_program = df_all.groupby('program_nama')['Durasi Total'].mean().sort_values(ascending=False)
-            avg_durasi_all = df_all['Durasi Total'].mean()
-            # REVISI WARNA: Menggunakan warna spesifik dari palet
-            fig3 = px.bar(durasi_per_program, y='Durasi Total', text_auto='.0f', labels={'program_nama':'Program', 'y':'Rata-rata Durasi (Hari)'},
-                          color_discrete_sequence=[YDSF_PALETTE[1]])
-            fig3.add_hline(y=avg_durasi_all, line_dash="dash", line_color="red", annotation_text="Rata-rata")
-            fig3.update_layout(dragmode=False)
-            st.plotly_chart(fig3, use_container_width=True)
-            program_terlama = durasi_per_program.index[0]
-            program_tercepat = durasi_per_program.index[-1]
+            def build_durasi_per_program():
+                px = plotly_express()
+                durasi_per_program = summarize_cube(cube_all, 'program_nama')['durasi_mean'].rename('Durasi Total').sort_values(ascending=False)
+                avg_durasi_all = cube_totals(cube_all)['durasi_mean']
+                # REVISI WARNA: Menggunakan warna spesifik dari palet
+                fig3 = px.bar(durasi_per_program, y='Durasi Total', text_auto='.0f', labels={'program_nama':'Program', 'y':'Rata-rata Durasi (Hari)'},
+                              color_discrete_sequence=[YDSF_PALETTE[1]])
+                fig3.add_hline(y=avg_durasi_all, line_dash="dash", line_color="red", annotation_text="Rata-rata")
+                fig3.update_layout(dragmode=False)
+                return fig3, durasi_per_program.index[0], durasi_per_program.index[-1]
+            fig3, program_terlama, program_tercepat = cached_figure("Home", "durasi_per_program", build_durasi_per_program)
+            show_chart(fig3, "durasi_per_program")
             st.markdown(f"""
             <div style='text-align: justify; font-size: 14px;'>
             <b>Analisis:</b> Membandingkan rata-rata kecepatan penyaluran bantuan per program.<br>
@@ -157,116 +272,181 @@ if selected_page == "Home":
             </div>""", unsafe_allow_html=True)
 
         st.info("**Tren Pertumbuhan Penyaluran Bantuan per Program**")
-        tren_tahunan_program = df_all.groupby(['Tahun', 'program_nama'])['Jumlah Bantuan'].sum().reset_index()
-        # REVISI WARNA: Menggunakan palet kontras tinggi
-        fig2 = px.line(tren_tahunan_program, x='Tahun', y='Jumlah Bantuan', color='program_nama', markers=True, 
-                       labels={'Tahun':'Tahun', 'Jumlah Bantuan':'Total Bantuan (Rp)', 'program_nama':'Program'},
-                       color_discrete_sequence=HIGH_CONTRAST_PALETTE)
-        fig2.update_layout(dragmode=False)
-        st.plotly_chart(fig2, use_container_width=True)
+        def build_tren_tahunan():
+            tren_tahunan_program = summarize_cube(cube_all, ['Tahun', 'program_nama'])['bantuan_sum'].rename('Jumlah Bantuan').reset_index()
+            # REVISI WARNA: Menggunakan palet kontras tinggi
+            px = plotly_express()
+            fig2 = px.line(tren_tahunan_program, x='Tahun', y='Jumlah Bantuan', color='program_nama', markers=True, 
+                           labels={'Tahun':'Tahun', 'Jumlah Bantuan':'Total Bantuan (Rp)', 'program_nama':'Program'},
+                           color_discrete_sequence=px.colors.qualitative.Plotly)
+            fig2.update_layout(dragmode=False)
+            return fig2
+        fig2 = cached_figure("Home", "tren_tahunan_program", build_tren_tahunan)
+        show_chart(fig2, "tren_tahunan_program")
         st.markdown("<div style='text-align: justify; font-size: 14px;'><b>Analisis:</b> Membandingkan pertumbuhan dana setiap program dari tahun ke tahun.<br><b>Insight:</b> Garis yang menanjak tajam menandakan pertumbuhan pesat, sementara garis yang landai menunjukkan program yang stabil atau sudah matang.</div>", unsafe_allow_html=True)
         
+# ==================================================================
+#                 HALAMAN PENCARIAN LINTAS PROGRAM
+# ==================================================================
+elif selected_page == "Pencarian Lintas Program":
+    st.header("Pencarian Penerima Lintas Program")
+    st.write("Cari seluruh riwayat penyaluran untuk satu penerima di semua program sekaligus.")
+
+    df_all = load_all_data()
+
+    if not df_all.empty:
+        recipient_query = st.text_input("Nomor KTP/SIM atau NIDS", placeholder="Masukkan KTP/SIM atau NIDS (harus sama persis)")
+        if recipient_query:
+            df_recipient = df_all.iloc[lookup_recipient(recipient_query)]
+            if df_recipient.empty:
+                st.warning(f"Tidak ada penerima dengan KTP/SIM atau NIDS **{recipient_query}**.")
+            else:
+                c1, c2, c3 = st.columns(3)
+                c1.metric("Jumlah Program", f"{df_recipient['program_nama'].nunique()} Program")
+                c2.metric("Jumlah Proses Penyaluran Bantuan", f"{df_recipient.shape[0]} Kali")
+                c3.metric("Total Bantuan Diterima", f"Rp {df_recipient['Jumlah Bantuan'].sum():,.0f}")
+                st.dataframe(df_recipient.drop(columns=['Cluster'], errors='ignore'))
+
+        st.markdown("---")
+        st.subheader("Penerima Ganda Lintas Program")
+        df_duplicates = load_duplicate_recipients()
+        st.write(f"Terdapat **{len(df_duplicates)}** KTP/SIM yang menerima bantuan dari lebih dari satu program.")
+        st.dataframe(df_duplicates)
+        st.markdown("<p style='font-size:12px; color:grey;'><i>Hanya KTP/SIM berupa nomor (minimal 8 digit) yang dicocokkan; isian seperti 'tanpa ktp' diabaikan.</i></p>", unsafe_allow_html=True)
+
 # ==================================================================
 #            HALAMAN LAIN (Tergantung pada Pilihan Program)
 # ==================================================================
 elif selected_program:
     st.header(f"{selected_page} - Program {selected_program}")
     
-    df_single = load_single_data(selected_program)
-    
     # --- HALAMAN DATA PENERIMA BANTUAN ---
     if selected_page == "Data Penerima Bantuan":
         st.info("Gunakan filter di bawah untuk menyeleksi data.")
-        all_years = sorted(df_single['Tahun'].dropna().unique().astype(int))
+        df_single = load_single_data(selected_program)
+        # Daftar tahun diambil dari kubus agregat (beberapa ratus baris), bukan dari seluruh baris data
+        all_years = sorted(load_cube(selected_program)['Tahun'].dropna().unique().astype(int))
         selected_years = st.multiselect("Filter berdasarkan Tahun:", options=all_years, default=all_years)
         if not selected_years:
             selected_years = all_years
         
         search_query = st.text_input("Pencarian", placeholder="Masukkan Nama Penerima atau KTP/SIM")
-        df_filtered_data = df_single[df_single['Tahun'].isin(selected_years)]
+        # Filter menghasilkan posisi baris saja (None = semua baris); data tidak disalin
+        filtered_rows = None
         if search_query:
-            df_filtered_data = df_filtered_data[
-                df_filtered_data['Nama Penerima'].str.contains(search_query, case=False, na=False) |
-                df_filtered_data['KTP/SIM'].astype(str).str.contains(search_query, case=False, na=False)
-            ]
-        st.dataframe(df_filtered_data.drop(columns=['Cluster'], errors='ignore'))
+            # Cari lewat indeks dulu, lalu filter tahun hanya pada baris hasil pencarian
+            filtered_rows = search_rows(selected_program, search_query)
+        if len(selected_years) < len(all_years) or df_single['Tahun'].hasnans:
+            tahun = df_single['Tahun'].to_numpy()
+            if filtered_rows is None:
+                filtered_rows = np.flatnonzero(np.isin(tahun, selected_years))
+            else:
+                filtered_rows = filtered_rows[np.isin(tahun[filtered_rows], selected_years)]
+        render_paginated_table(df_single, key="tabel_penerima", file_name=f"penerima_{selected_program.lower()}.csv",
+                               program=selected_program, rows=filtered_rows)
         st.markdown("<p style='font-size:12px; color:grey;'><i><b>Durasi Total:</b> Waktu yang dibutuhkan (dalam hari) dari pengajuan awal hingga bantuan diterima oleh penerima.</i></p>", unsafe_allow_html=True)
 
     # --- HALAMAN ANALISIS EKSPLORATIF (EDA) ---
     elif selected_page == "Analisis Eksploratif (EDA)":
         st.subheader("Filter Data")
-        list_tahun = ["Semua Tahun"] + sorted(df_single['Tahun'].dropna().unique().astype(int), reverse=True)
+        cube_program = load_cube(selected_program)
+        list_tahun = ["Semua Tahun"] + sorted(cube_program['Tahun'].dropna().unique().astype(int), reverse=True)
         tahun_terpilih = st.selectbox("Pilih Tahun Analisis:", options=list_tahun)
 
-        df_filtered_eda = df_single if tahun_terpilih == "Semua Tahun" else df_single[df_single['Tahun'] == tahun_terpilih]
+        # Semua angka di halaman ini dihitung dari kubus agregat, bukan dari baris data mentah
+        cube_eda = cube_program if tahun_terpilih == "Semua Tahun" else cube_program[cube_program['Tahun'] == tahun_terpilih]
+        with profiler.section("aggregation: ringkasan EDA"):
+            totals_eda = cube_totals(cube_eda)
 
         st.markdown("---")
         st.subheader(f"Ringkasan Umum Program - Periode {tahun_terpilih}")
         c1, c2, c3 = st.columns(3)
-        c1.metric("Jumlah Nominal Bantuan yang Disalurkan", f"Rp {df_filtered_eda['Jumlah Bantuan'].sum():,.0f}")
-        c2.metric("Jumlah Proses Penyaluran Bantuan", f"{df_filtered_eda.shape[0]} Kali")
-        avg_durasi_val = df_filtered_eda['Durasi Total'].mean() if not df_filtered_eda.empty else 0
+        c1.metric("Jumlah Nominal Bantuan yang Disalurkan", f"Rp {totals_eda['bantuan_sum']:,.0f}")
+        c2.metric("Jumlah Proses Penyaluran Bantuan", f"{totals_eda['jumlah']} Kali")
+        avg_durasi_val = totals_eda['durasi_mean'] if totals_eda['jumlah'] else 0
         c3.metric("Rata-rata Durasi", f"{avg_durasi_val:.0f} Hari")
         
         st.markdown("---")
         st.subheader("Visualisasi Detail Analisis")
         
         # --- REVISI TATA LETAK EDA DIMULAI DARI SINI ---
+        # Grafik disimpan di cache per (program, tahun[, kota]) sehingga rerun karena widget lain tidak membangunnya ulang
+        eda_filter = dict(program=selected_program, year=tahun_terpilih)
         vcol1, vcol2 = st.columns(2)
         with vcol1:
             st.info("**Top 10 Kategori Subprogram**")
-            top_sub = df_filtered_eda['Kat. Subprogram'].value_counts().nlargest(10)
-            fig_top_sub = px.bar(top_sub, y=top_sub.index, x=top_sub.values, orientation='h', text_auto=True, labels={'y':'', 'x':'Jumlah Transaksi'})
-            fig_top_sub.update_layout(yaxis={'categoryorder':'total ascending'}, dragmode=False)
-            st.plotly_chart(fig_top_sub, use_container_width=True)
-            top_program_nama = top_sub.index[0] if not top_sub.empty else "N/A"
+            def build_top_sub():
+                px = plotly_express()
+                top_sub = summarize_cube(cube_eda, 'Kat. Subprogram')['jumlah'].nlargest(10)
+                fig_top_sub = px.bar(top_sub, y=top_sub.index, x=top_sub.values, orientation='h', text_auto=True, labels={'y':'', 'x':'Jumlah Transaksi'})
+                fig_top_sub.update_layout(yaxis={'categoryorder':'total ascending'}, dragmode=False)
+                return fig_top_sub, top_sub.index[0] if not top_sub.empty else "N/A"
+            fig_top_sub, top_program_nama = cached_figure("EDA", "top_sub", build_top_sub, **eda_filter)
+            show_chart(fig_top_sub, "top_sub")
             st.markdown(f"<div style='font-size:14px;'><b>Insight:</b> Subprogram **'{top_program_nama}'** adalah aktivitas inti dari program ini pada periode **{tahun_terpilih}**.</div>", unsafe_allow_html=True)
             
             st.info("**Jumlah Bantuan Rata-rata per Subprogram**")
-            avg_bantuan_sub = df_filtered_eda.groupby('Kat. Subprogram')['Jumlah Bantuan'].mean().nlargest(10).sort_values()
-            fig_v2 = px.bar(avg_bantuan_sub, x='Jumlah Bantuan', orientation='h', text_auto='.2s', labels={'index':'Subprogram', 'Jumlah Bantuan':'Rata-rata Bantuan (Rp)'})
-            fig_v2.update_layout(dragmode=False)
-            st.plotly_chart(fig_v2, use_container_width=True)
-            sub_terbesar = avg_bantuan_sub.index[-1] if not avg_bantuan_sub.empty else "N/A"
+            def build_avg_bantuan_sub():
+                px = plotly_express()
+                avg_bantuan_sub = summarize_cube(cube_eda, 'Kat. Subprogram')['bantuan_mean'].rename('Jumlah Bantuan').nlargest(10).sort_values()
+                fig_v2 = px.bar(avg_bantuan_sub, x='Jumlah Bantuan', orientation='h', text_auto='.2s', labels={'index':'Subprogram', 'Jumlah Bantuan':'Rata-rata Bantuan (Rp)'})
+                fig_v2.update_layout(dragmode=False)
+                return fig_v2, avg_bantuan_sub.index[-1] if not avg_bantuan_sub.empty else "N/A"
+            fig_v2, sub_terbesar = cached_figure("EDA", "avg_bantuan_sub", build_avg_bantuan_sub, **eda_filter)
+            show_chart(fig_v2, "avg_bantuan_sub")
             st.markdown(f"<div style='font-size:14px;'><b>Insight:</b> Subprogram **'{sub_terbesar}'** secara konsisten memberikan bantuan dengan nominal paling besar, menandakan ini adalah bantuan 'high-value'.</div>", unsafe_allow_html=True)
             
         with vcol2:
             st.info("**Top 10 Kota Penerima Bantuan**")
-            top_kota = df_filtered_eda['Kota'].value_counts().nlargest(10)
-            fig_top_kota = px.bar(top_kota, y=top_kota.index, x=top_kota.values, orientation='h', text_auto=True, labels={'y':'', 'x':'Jumlah Transaksi'})
-            fig_top_kota.update_layout(yaxis={'categoryorder':'total ascending'}, dragmode=False)
-            st.plotly_chart(fig_top_kota, use_container_width=True)
-            top_kota_nama = top_kota.index[0] if not top_kota.empty else "N/A"
+            def build_top_kota():
+                px = plotly_express()
+                top_kota = summarize_cube(cube_eda, 'Kota')['jumlah'].nlargest(10)
+                fig_top_kota = px.bar(top_kota, y=top_kota.index, x=top_kota.values, orientation='h', text_auto=True, labels={'y':'', 'x':'Jumlah Transaksi'})
+                fig_top_kota.update_layout(yaxis={'categoryorder':'total ascending'}, dragmode=False)
+                return fig_top_kota, top_kota.index[0] if not top_kota.empty else "N/A"
+            fig_top_kota, top_kota_nama = cached_figure("EDA", "top_kota", build_top_kota, **eda_filter)
+            show_chart(fig_top_kota, "top_kota")
             st.markdown(f"<div style='font-size:14px;'><b>Insight:</b> Wilayah **{top_kota_nama}** menjadi fokus utama penyaluran untuk program ini pada periode **{tahun_terpilih}**.</div>", unsafe_allow_html=True)
             
             st.info("**Total Bantuan Berdasarkan Sumber Anggaran**")
-            sum_bantuan_sumber = df_filtered_eda.groupby('Sumber Anggaran')['Jumlah Bantuan'].sum().sort_values()
-            fig_v4 = px.bar(sum_bantuan_sumber, x=sum_bantuan_sumber.index, y='Jumlah Bantuan', text_auto='.2s', labels={'x':'Sumber Anggaran', 'Jumlah Bantuan':'Total Bantuan (Rp)'})
-            fig_v4.update_layout(dragmode=False)
-            st.plotly_chart(fig_v4, use_container_width=True)
-            sumber_terbesar = sum_bantuan_sumber.index[-1] if not sum_bantuan_sumber.empty else "N/A"
+            def build_sum_bantuan_sumber():
+                px = plotly_express()
+                sum_bantuan_sumber = summarize_cube(cube_eda, 'Sumber Anggaran')['bantuan_sum'].rename('Jumlah Bantuan').sort_values()
+                fig_v4 = px.bar(sum_bantuan_sumber, x=sum_bantuan_sumber.index, y='Jumlah Bantuan', text_auto='.2s', labels={'x':'Sumber Anggaran', 'Jumlah Bantuan':'Total Bantuan (Rp)'})
+                fig_v4.update_layout(dragmode=False)
+                return fig_v4, sum_bantuan_sumber.index[-1] if not sum_bantuan_sumber.empty else "N/A"
+            fig_v4, sumber_terbesar = cached_figure("EDA", "sum_bantuan_sumber", build_sum_bantuan_sumber, **eda_filter)
+            show_chart(fig_v4, "sum_bantuan_sumber")
             st.markdown(f"<div style='font-size:14px;'><b>Insight:</b> Dana dari **{sumber_terbesar}** menjadi penopang finansial utama untuk program ini pada periode **{tahun_terpilih}**.</div>", unsafe_allow_html=True)
 
         st.markdown("---")
         
         st.info("**Rata-rata Durasi Total per Tahun**")
-        avg_durasi_tahun = df_filtered_eda.groupby('Tahun')['Durasi Total'].mean().reset_index()
-        fig_v1 = px.line(avg_durasi_tahun, x='Tahun', y='Durasi Total', markers=True, labels={'Durasi Total': 'Rata-rata Durasi (Hari)'})
-        fig_v1.update_layout(dragmode=False)
-        st.plotly_chart(fig_v1, use_container_width=True)
+        def build_avg_durasi_tahun():
+            px = plotly_express()
+            avg_durasi_tahun = summarize_cube(cube_eda, 'Tahun')['durasi_mean'].rename('Durasi Total').reset_index()
+            fig_v1 = px.line(avg_durasi_tahun, x='Tahun', y='Durasi Total', markers=True, labels={'Durasi Total': 'Rata-rata Durasi (Hari)'})
+            fig_v1.update_layout(dragmode=False)
+            return fig_v1
+        fig_v1 = cached_figure("EDA", "avg_durasi_tahun", build_avg_durasi_tahun, **eda_filter)
+        show_chart(fig_v1, "avg_durasi_tahun")
         st.markdown("<div style='font-size:14px;'><b>Insight:</b> Jika garis tren menurun, maka proses penyaluran program ini menjadi semakin efisien setiap tahunnya. Sebaliknya, jika menanjak, perlu ada evaluasi proses.</div>", unsafe_allow_html=True)
         
         st.markdown("---")
         st.subheader("Analisis Interaktif: Top Subprogram per Kota")
-        list_kota = ["Semua Kota"] + sorted(df_filtered_eda['Kota'].dropna().unique())
+        list_kota = ["Semua Kota"] + sorted(cube_eda['Kota'].dropna().unique())
         kota_terpilih = st.selectbox("Pilih Kota untuk melihat detail Subprogram:", options=list_kota)
-        df_kota_filtered = df_filtered_eda if kota_terpilih == "Semua Kota" else df_filtered_eda[df_filtered_eda['Kota'] == kota_terpilih]
+        cube_kota = cube_eda if kota_terpilih == "Semua Kota" else cube_eda[cube_eda['Kota'] == kota_terpilih]
         
         st.info(f"**Top 5 Subprogram di {kota_terpilih}**")
-        top_sub_kota = df_kota_filtered['Kat. Subprogram'].value_counts().nlargest(5)
-        fig_v7 = px.bar(top_sub_kota, y=top_sub_kota.index, x=top_sub_kota.values, orientation='h', text_auto=True, labels={'y':'Subprogram', 'x':'Jumlah Transaksi'})
-        fig_v7.update_layout(dragmode=False)
-        st.plotly_chart(fig_v7, use_container_width=True)
+        def build_top_sub_kota():
+            px = plotly_express()
+            top_sub_kota = summarize_cube(cube_kota, 'Kat. Subprogram')['jumlah'].nlargest(5)
+            fig_v7 = px.bar(top_sub_kota, y=top_sub_kota.index, x=top_sub_kota.values, orientation='h', text_auto=True, labels={'y':'Subprogram', 'x':'Jumlah Transaksi'})
+            fig_v7.update_layout(dragmode=False)
+            return fig_v7
+        fig_v7 = cached_figure("EDA", "top_sub_kota", build_top_sub_kota, city=kota_terpilih, **eda_filter)
+        show_chart(fig_v7, "top_sub_kota")
 
     # --- BAGIAN UNTUK HALAMAN PROFILING CLUSTER ---
     elif selected_page == "Profiling Cluster":
@@ -274,7 +454,7 @@ elif selected_program:
         if not info or not info.get("nama_cluster"):
             st.warning(f"Informasi cluster untuk '{selected_program}' belum diatur.")
         else:
-            nama_cluster_options = ["Pilih cluster..."] + list(info["nama_cluster"].values())
+            nama_cluster_options = ["Pilih cluster...", "Bandingkan Semua Cluster"] + list(info["nama_cluster"].values())
             selected_cluster_nama = st.selectbox("Pilih Cluster untuk Melihat Profil Detail:", options=nama_cluster_options)
 
             if selected_cluster_nama != "Pilih cluster...":
@@ -282,67 +462,96 @@ elif selected_program:
                 st.info(info.get("penjelasan", "Tidak ada penjelasan mengenai dasar penamaan cluster."))
                 st.markdown("---")
                 
-                list_tahun_cluster = ["Semua Tahun"] + sorted(df_single['Tahun'].dropna().unique().astype(int), reverse=True)
+                cluster_profile = load_cluster_profile(selected_program)
+                list_tahun_cluster = ["Semua Tahun"] + cluster_profile.years[::-1]
                 tahun_terpilih_cluster = st.selectbox("Pilih Tahun Analisis:", options=list_tahun_cluster, key="filter_tahun_cluster")
-                
+                tahun_profil = None if tahun_terpilih_cluster == "Semua Tahun" else tahun_terpilih_cluster
+
+            if selected_cluster_nama == "Bandingkan Semua Cluster":
+                with profiler.section("aggregation: perbandingan cluster"):
+                    comparison_df = cluster_profile.comparison(info["nama_cluster"], tahun_profil)
+                if comparison_df.empty:
+                    st.warning(f"Tidak ada data cluster pada tahun {tahun_terpilih_cluster}.")
+                else:
+                    st.markdown("#### Perbandingan Ringkasan Statistik Antar Cluster")
+                    st.table(comparison_df)
+
+            elif selected_cluster_nama != "Pilih cluster...":
                 selected_cluster_key = [k for k, v in info["nama_cluster"].items() if v == selected_cluster_nama][0]
-                df_cluster_all_years = df_single[df_single['Cluster'] == selected_cluster_key].copy()
-                
-                df_cluster = df_cluster_all_years if tahun_terpilih_cluster == "Semua Tahun" else df_cluster_all_years[df_cluster_all_years['Tahun'] == tahun_terpilih_cluster]
+                with profiler.section("aggregation: filter cluster"):
+                    cluster_rows = cluster_profile.rows(selected_cluster_key, tahun_profil)
 
-                if df_cluster.empty:
+                if not len(cluster_rows):
                     st.warning(f"Tidak ada data untuk cluster ini pada tahun {tahun_terpilih_cluster}.")
                 else:
                     st.markdown("#### Ringkasan Statistik Cluster")
-                    summary_df = generate_cluster_summary_df(df_cluster)
+                    with profiler.section("aggregation: ringkasan cluster"):
+                        summary_df = cluster_profile.summary(selected_cluster_key, tahun_profil)
                     st.table(summary_df)
                     
                     st.markdown("---")
                     st.subheader("Visualisasi Karakteristik Cluster")
                     
+                    cluster_filter = dict(program=selected_program, year=tahun_terpilih_cluster, cluster=selected_cluster_key)
                     vcol1, vcol2 = st.columns(2)
                     with vcol1:
                         st.info("**Top 5 Jumlah Bantuan Paling Sering Diberikan**")
-                        top_bantuan = df_cluster['Jumlah Bantuan'].value_counts().nlargest(5)
-                        fig_bantuan = px.bar(top_bantuan, y=top_bantuan.index, x=top_bantuan.values, orientation='h', text_auto=True, labels={'y':'Jumlah Bantuan (Rp)', 'x':'Frekuensi'})
-                        fig_bantuan.update_layout(yaxis={'type': 'category', 'categoryorder':'total ascending'}, dragmode=False)
-                        st.plotly_chart(fig_bantuan, use_container_width=True)
-                        bantuan_dominan = f"Rp {top_bantuan.index[0]:,.0f}" if not top_bantuan.empty else "N/A"
+                        def build_top_bantuan():
+                            px = plotly_express()
+                            top_bantuan = cluster_profile.value_counts('Jumlah Bantuan', selected_cluster_key, tahun_profil).nlargest(5)
+                            fig_bantuan = px.bar(top_bantuan, y=top_bantuan.index, x=top_bantuan.values, orientation='h', text_auto=True, labels={'y':'Jumlah Bantuan (Rp)', 'x':'Frekuensi'})
+                            fig_bantuan.update_layout(yaxis={'type': 'category', 'categoryorder':'total ascending'}, dragmode=False)
+                            return fig_bantuan, f"Rp {top_bantuan.index[0]:,.0f}" if not top_bantuan.empty else "N/A"
+                        fig_bantuan, bantuan_dominan = cached_figure("Profiling Cluster", "top_bantuan", build_top_bantuan, **cluster_filter)
+                        show_chart(fig_bantuan, "top_bantuan")
                         st.markdown(f"<div style='font-size:14px;'><b>Insight:</b> Nominal bantuan **{bantuan_dominan}** adalah yang paling sering diberikan untuk segmen ini.</div>", unsafe_allow_html=True)
 
                         st.info("**Top 5 Kota Paling Dominan**")
-                        top_kota = df_cluster['Kota'].value_counts().nlargest(5)
-                        fig_kota = px.bar(top_kota, y=top_kota.index, x=top_kota.values, orientation='h', text_auto=True, labels={'y':'Kota', 'x':'Jumlah Penerima'})
-                        fig_kota.update_layout(yaxis={'categoryorder':'total ascending'}, dragmode=False)
-                        st.plotly_chart(fig_kota, use_container_width=True)
-                        kota_dominan = top_kota.index[0] if not top_kota.empty else "N/A"
+                        def build_top_kota_cluster():
+                            px = plotly_express()
+                            top_kota = cluster_profile.value_counts('Kota', selected_cluster_key, tahun_profil).nlargest(5)
+                            fig_kota = px.bar(top_kota, y=top_kota.index, x=top_kota.values, orientation='h', text_auto=True, labels={'y':'Kota', 'x':'Jumlah Penerima'})
+                            fig_kota.update_layout(yaxis={'categoryorder':'total ascending'}, dragmode=False)
+                            return fig_kota, top_kota.index[0] if not top_kota.empty else "N/A"
+                        fig_kota, kota_dominan = cached_figure("Profiling Cluster", "top_kota", build_top_kota_cluster, **cluster_filter)
+                        show_chart(fig_kota, "top_kota")
                         st.markdown(f"<div style='font-size:14px;'><b>Insight:</b> Wilayah **{kota_dominan}** menjadi basis utama untuk cluster ini.</div>", unsafe_allow_html=True)
                     
                     with vcol2:
                         st.info("**Top 5 Durasi Tunggu Paling Sering**")
-                        top_durasi = df_cluster['Durasi Total'].value_counts().nlargest(5)
-                        fig_durasi = px.bar(top_durasi, y=top_durasi.index, x=top_durasi.values, orientation='h', text_auto=True, labels={'y':'Durasi Total (Hari)', 'x':'Frekuensi'})
-                        fig_durasi.update_layout(yaxis={'type': 'category', 'categoryorder':'total ascending'}, dragmode=False)
-                        st.plotly_chart(fig_durasi, use_container_width=True)
-                        durasi_dominan = top_durasi.index[0] if not top_durasi.empty else "N/A"
+                        def build_top_durasi():
+                            px = plotly_express()
+                            top_durasi = cluster_profile.value_counts('Durasi Total', selected_cluster_key, tahun_profil).nlargest(5)
+                            fig_durasi = px.bar(top_durasi, y=top_durasi.index, x=top_durasi.values, orientation='h', text_auto=True, labels={'y':'Durasi Total (Hari)', 'x':'Frekuensi'})
+                            fig_durasi.update_layout(yaxis={'type': 'category', 'categoryorder':'total ascending'}, dragmode=False)
+                            return fig_durasi, top_durasi.index[0] if not top_durasi.empty else "N/A"
+                        fig_durasi, durasi_dominan = cached_figure("Profiling Cluster", "top_durasi", build_top_durasi, **cluster_filter)
+                        show_chart(fig_durasi, "top_durasi")
                         st.markdown(f"<div style='font-size:14px;'><b>Insight:</b> Durasi proses yang paling umum untuk cluster ini adalah **{durasi_dominan} hari**.</div>", unsafe_allow_html=True)
                         
                         st.info("**Top 5 Subprogram Paling Dominan**")
-                        top_sub = df_cluster['Kat. Subprogram'].value_counts().nlargest(5)
-                        fig_sub = px.bar(top_sub, y=top_sub.index, x=top_sub.values, orientation='h', text_auto=True, labels={'y':'', 'x':'Jumlah Penerima'})
-                        fig_sub.update_layout(yaxis={'categoryorder':'total ascending'}, dragmode=False)
-                        st.plotly_chart(fig_sub, use_container_width=True)
-                        sub_dominan = top_sub.index[0] if not top_sub.empty else "N/A"
+                        def build_top_sub_cluster():
+                            px = plotly_express()
+                            top_sub = cluster_profile.value_counts('Kat. Subprogram', selected_cluster_key, tahun_profil).nlargest(5)
+                            fig_sub = px.bar(top_sub, y=top_sub.index, x=top_sub.values, orientation='h', text_auto=True, labels={'y':'', 'x':'Jumlah Penerima'})
+                            fig_sub.update_layout(yaxis={'categoryorder':'total ascending'}, dragmode=False)
+                            return fig_sub, top_sub.index[0] if not top_sub.empty else "N/A"
+                        fig_sub, sub_dominan = cached_figure("Profiling Cluster", "top_sub", build_top_sub_cluster, **cluster_filter)
+                        show_chart(fig_sub, "top_sub")
                         st.markdown(f"<div style='font-size:14px;'><b>Insight:</b> Aktivitas utama dalam cluster ini adalah **'{sub_dominan}'**.</div>", unsafe_allow_html=True)
                     
                     st.info("**Distribusi Sumber Anggaran**")
-                    sumber_anggaran = df_cluster['Sumber Anggaran'].value_counts()
-                    fig_pie = px.pie(sumber_anggaran, names=sumber_anggaran.index, values=sumber_anggaran.values, hole=0.5)
-                    fig_pie.update_traces(textposition='inside', textinfo='percent+label')
-                    fig_pie.update_layout(dragmode=False)
-                    st.plotly_chart(fig_pie, use_container_width=True)
-                    sumber_dominan_pie = sumber_anggaran.index[0] if not sumber_anggaran.empty else "N/A"
-                    persen_dominan_pie = sumber_anggaran.iloc[0]/sumber_anggaran.sum() if not sumber_anggaran.empty else 0
+                    def build_sumber_anggaran():
+                        px = plotly_express()
+                        sumber_anggaran = cluster_profile.value_counts('Sumber Anggaran', selected_cluster_key, tahun_profil)
+                        fig_pie = px.pie(sumber_anggaran, names=sumber_anggaran.index, values=sumber_anggaran.values, hole=0.5)
+                        fig_pie.update_traces(textposition='inside', textinfo='percent+label')
+                        fig_pie.update_layout(dragmode=False)
+                        sumber_dominan_pie = sumber_anggaran.index[0] if not sumber_anggaran.empty else "N/A"
+                        persen_dominan_pie = sumber_anggaran.iloc[0]/sumber_anggaran.sum() if not sumber_anggaran.empty else 0
+                        return fig_pie, sumber_dominan_pie, persen_dominan_pie
+                    fig_pie, sumber_dominan_pie, persen_dominan_pie = cached_figure("Profiling Cluster", "sumber_anggaran", build_sumber_anggaran, **cluster_filter)
+                    show_chart(fig_pie, "sumber_anggaran")
                     st.markdown(f"<div style='font-size:14px;'><b>Insight:</b> Sumber pendanaan untuk cluster ini didominasi oleh **{sumber_dominan_pie}** ({persen_dominan_pie:.1%}).</div>", unsafe_allow_html=True)
                     
                     st.markdown("---")
@@ -351,12 +560,34 @@ elif selected_program:
                     
                     search_query_cluster = st.text_input("Cari di dalam cluster:", placeholder="Masukkan Nama Penerima atau KTP/SIM", key="search_cluster")
                     
-                    df_table_cluster = df_cluster
                     if search_query_cluster:
-                        df_table_cluster = df_cluster[
-                            df_cluster['Nama Penerima'].str.contains(search_query_cluster, case=False, na=False) |
-                            df_cluster['KTP/SIM'].astype(str).str.contains(search_query_cluster, case=False, na=False)
-                        ]
-                    st.dataframe(df_table_cluster.drop(columns=['Cluster'], errors='ignore'))
+                        # Posisi baris profil dan hasil indeks pencarian sama-sama posisi pada df_single
+                        cluster_rows = np.intersect1d(cluster_rows, search_rows(selected_program, search_query_cluster))
+                    # Data lengkap baru dimuat di sini, untuk tabel penerima
+                    render_paginated_table(load_single_data(selected_program), key="tabel_cluster",
+                                           file_name=f"penerima_{selected_program.lower()}_cluster_{selected_cluster_key}.csv",
+                                           program=selected_program, rows=cluster_rows)
 else:
-    st.info("👈 Silakan pilih program di sidebar untuk melihat detailnya.")
\ No newline at end of file
+    st.info("👈 Silakan pilih program di sidebar untuk melihat detailnya.")
+
+# --- PANEL DEBUG (hanya tampil bila mode instrumentasi aktif) ---
+if profiler.enabled:
+    rerun_record = profiler.finish(figure_cache=get_figure_cache().stats(), data_version=get_data_store().version)
+    with st.sidebar.expander("Debug: Profiling Rerun"):
+        d1, d2 = st.columns(2)
+        d1.metric("Durasi Rerun", f"{rerun_record['total_ms']:.0f} ms")
+        d2.metric("Perubahan Memori", f"{rerun_record['rss_delta_mb']:+.1f} MB", help=f"RSS akhir {rerun_record['rss_end_mb']:.0f} MB")
+        if rerun_record['sections']:
+            df_sections = pd.DataFrame(rerun_record['sections']).sort_values('start_ms')
+            df_sections['section'] = ["\u00a0\u00a0" * depth + name for depth, name in zip(df_sections['depth'], df_sections['section'])]
+            st.dataframe(df_sections[['section', 'ms']].round(1), hide_index=True)
+        if rerun_record['cache']:
+            st.markdown("**Cache (rerun ini)**")
+            st.dataframe(pd.DataFrame(rerun_record['cache']).T)
+        st.markdown("**Cache Grafik (proses)**")
+        st.json(rerun_record['figure_cache'])
+        memory_report = get_data_store().memory_report()
+        if memory_report:
+            # Sebelum pemadatan = hasil baca file sumber (semua kolom); di memori = kolom yang sudah dimuat
+            st.markdown("**Memori Data (proses)**")
+            st.dataframe(pd.DataFrame(memory_report).round(2), hide_index=True)
\ No newline at end of file
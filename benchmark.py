@@ -0,0 +1,289 @@
+"""Benchmark lapisan data dan perhitungan halaman dashboard, tanpa browser.
+
+Contoh:
+    python benchmark.py                               # data asli di data/
+    python benchmark.py --scales 1 10 100 --repeat 5  # ditambah data sintetis 10x dan 100x
+    python benchmark.py --save-baseline hasil_awal.json
+    python benchmark.py --baseline hasil_awal.json    # bandingkan dengan hasil sebelumnya
+"""
+import argparse
+import gc
+import hashlib
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from aggregates import ClusterProfile, build_cube, cube_totals, summarize_cube
+from csv_validation import EXPECTED_COLUMNS
+from data_store import (CACHE_DIR_NAME, DATA_FILES, DELTA_DIR_NAME, DataStore, delta_files, file_hash,
+                        read_program_file)
+from search_index import SearchIndex
+
+SEARCH_QUERIES = ['ahmad', 'nur', '3578', 'siti aminah']
+
+
+# --- DATA SINTETIS ---
+# Data sintetis ditulis sebagai xlsx (format sumber produksi) agar pemuatan tanpa cache di setiap skala mengukur
+# parser yang sama; karena lambat dibuat, hasilnya disimpan di sini dan dipakai lagi selama data asli tidak berubah
+SYNTHETIC_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'ydsf_bench_synthetic')
+
+
+def write_xlsx(df, path):
+    """Menulis DataFrame ke sheet pertama file xlsx dengan openpyxl mode write-only (baris per baris)."""
+    import openpyxl
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(list(df.columns))
+    for row in df.astype(object).where(df.notna(), None).itertuples(index=False, name=None):
+        sheet.append(row)
+    workbook.save(path)
+
+
+def generate_synthetic_data(scale, out_dir, seed=0):
+    """Membuat salinan DATA_FILES (xlsx) berukuran `scale` kali lipat dengan skema dan sebaran nilai yang sama.
+
+    Baris diambil acak (dengan pengembalian) dari data asli; NIDS, KTP/SIM dan Nama Penerima diberi
+    penanda replika agar jumlah penerima unik ikut bertambah seperti pada data yang tumbuh sungguhan.
+    """
+    rng = np.random.default_rng(seed)
+    data_files = {}
+    for program, file_path in DATA_FILES.items():
+        source = read_program_file(file_path)[EXPECTED_COLUMNS].astype({'NIDS': 'int64'})
+        n_rows = len(source) * scale
+        df = source.iloc[rng.integers(0, len(source), n_rows)].reset_index(drop=True)
+        replica = np.arange(n_rows) // len(source)
+        df['NIDS'] = df['NIDS'] + replica * (int(source['NIDS'].max()) + 1)
+        df['KTP/SIM'] = df['KTP/SIM'].where(replica == 0, df['KTP/SIM'] + replica.astype(str))
+        df['Nama Penerima'] = df['Nama Penerima'].where(replica == 0, df['Nama Penerima'] + ' ' + replica.astype(str))
+
+        out_path = os.path.join(out_dir, os.path.splitext(os.path.basename(file_path))[0] + '.xlsx')
+        write_xlsx(df, out_path)
+        data_files[program] = out_path
+    return data_files
+
+
+def synthetic_data_files(scale, out_dir, seed=0):
+    """Salinan data sintetis `scale` kali lipat di out_dir, dibuat sekali lalu diambil dari SYNTHETIC_CACHE_DIR."""
+    key = hashlib.sha256(json.dumps([scale, seed] + [file_hash(path) for path in DATA_FILES.values()]).encode())
+    cache_dir = os.path.join(SYNTHETIC_CACHE_DIR, f"{scale}x_{key.hexdigest()[:16]}")
+    if not os.path.isdir(cache_dir):
+        print(f"Membuat data sintetis {scale}x di {cache_dir} ...", file=sys.stderr)
+        os.makedirs(SYNTHETIC_CACHE_DIR, exist_ok=True)
+        # Dibuat di folder sementara lalu diganti nama, agar pembuatan yang terputus tidak dipakai ulang
+        build_dir = tempfile.mkdtemp(prefix=f"{scale}x_", dir=SYNTHETIC_CACHE_DIR)
+        try:
+            generate_synthetic_data(scale, build_dir, seed)
+            os.replace(build_dir, cache_dir)
+        except BaseException:
+            shutil.rmtree(build_dir, ignore_errors=True)
+            raise
+    data_files = {program: os.path.join(cache_dir, os.path.basename(path)) for program, path in DATA_FILES.items()}
+    return copy_data_files(data_files, out_dir)
+
+
+def copy_data_files(data_files, out_dir):
+    """Menyalin file program (beserta file delta-nya) ke out_dir, agar benchmark tidak menyentuh cache data asli."""
+    copies = {}
+    for program, file_path in data_files.items():
+        copies[program] = shutil.copy2(file_path, os.path.join(out_dir, os.path.basename(file_path)))
+        for path in delta_files(file_path):
+            os.makedirs(os.path.join(out_dir, DELTA_DIR_NAME), exist_ok=True)
+            shutil.copy2(path, os.path.join(out_dir, DELTA_DIR_NAME, os.path.basename(path)))
+    return copies
+
+
+# --- PENGUKURAN ---
+def measure(func, repeat, setup=None):
+    """Menjalankan func() sebanyak `repeat` kali; mengembalikan persentil latensi (ms) dan puncak memori (MB).
+
+    Puncak memori diukur pada satu putaran terpisah dengan tracemalloc (alokasi Python/NumPy/pandas;
+    buffer Arrow di luar jangkauan tracemalloc), agar overhead pelacakan tidak memengaruhi latensi.
+    """
+    timings = []
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        gc.collect()
+        start = time.perf_counter()
+        func(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    args = setup() if setup else ()
+    gc.collect()
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'n': repeat,
+        'p50_ms': float(np.percentile(timings, 50)),
+        'p90_ms': float(np.percentile(timings, 90)),
+        'p99_ms': float(np.percentile(timings, 99)),
+        'max_ms': float(max(timings)),
+        'peak_mb': peak / 1024 ** 2,
+    }
+
+
+def store_without_cache(data_files):
+    """DataStore baru dengan cache Feather dihapus, untuk mengukur pemuatan pertama setelah deploy.
+
+    Hanya dipakai pada salinan data di folder sementara (lihat run_benchmarks), bukan pada folder data/ asli.
+    """
+    for file_path in data_files.values():
+        shutil.rmtree(os.path.join(os.path.dirname(file_path), CACHE_DIR_NAME), ignore_errors=True)
+    return (DataStore(data_files),)
+
+
+def benchmark_operations(data_files):
+    """Daftar (nama operasi, fungsi, setup) untuk satu set file data."""
+    largest = max(data_files, key=lambda program: os.path.getsize(data_files[program]))
+
+    # Store yang sudah terisi dipakai untuk operasi yang mengukur perhitungan halaman saja
+    warm = DataStore(data_files)
+    warm.combined()
+    df_largest = warm.get(largest)
+    cube_all = warm.cube()
+    cube_largest = warm.cube(largest)
+    latest_year = int(df_largest['Tahun'].max())
+    search_index = warm.search_index(largest)
+
+    def cluster_page():
+        # Sama seperti halaman Profiling Cluster: profil dibangun sekali, lalu ringkasan + Top 5 setiap cluster
+        profile = ClusterProfile(df_largest)
+        for key in profile.clusters:
+            profile.summary(key)
+            profile.value_counts('Jumlah Bantuan', key).nlargest(5)
+            profile.value_counts('Durasi Total', key).nlargest(5)
+
+    def home_page():
+        summarize_cube(cube_all, 'program_nama')
+        summarize_cube(cube_all, ['Tahun', 'program_nama'])
+        cube_totals(cube_all)
+
+    def eda_page():
+        cube_year = cube_largest[cube_largest['Tahun'] == latest_year]
+        cube_totals(cube_year)
+        for by in ['Kat. Subprogram', 'Kota', 'Sumber Anggaran', 'Tahun']:
+            summarize_cube(cube_year, by)
+
+    def search():
+        for query in SEARCH_QUERIES:
+            search_index.search(query)
+
+    return [
+        (f'read_source[{largest}]', lambda: read_program_file(data_files[largest]), None),
+        (f'load_single_data[{largest}]', lambda store: store.get(largest), lambda: (DataStore(data_files),)),
+        ('load_all_data', lambda store: store.combined(), lambda: (DataStore(data_files),)),
+        ('load_all_data[tanpa_cache]', lambda store: store.combined(), lambda: store_without_cache(data_files)),
+        # Pemuatan pertama halaman Home: hanya kolom kubus yang dibaca dari cache
+        ('load_cube[semua]', lambda store: store.cube(), lambda: (DataStore(data_files),)),
+        ('build_cube[semua]', lambda: build_cube(warm.combined()), None),
+        (f'profiling_cluster[{largest}]', cluster_page, None),
+        ('halaman_home', home_page, None),
+        (f'halaman_eda[{largest},{latest_year}]', eda_page, None),
+        (f'build_search_index[{largest}]', lambda: SearchIndex(df_largest), None),
+        (f'search[{largest}]', search, None),
+    ]
+
+
+def memory_footprint(data_files):
+    """Ukuran memori setiap program sebelum dan sesudah pemadatan tipe (MB), dari DataStore yang dimuat penuh."""
+    store = DataStore(data_files)
+    store.load_all()
+    return {row['program']: {'raw_mb': row['MB sebelum pemadatan'], 'compact_mb': row['MB di memori']}
+            for row in store.memory_report()}
+
+
+def run_benchmarks(scales, repeat):
+    """Mengukur semua operasi untuk setiap skala; mengembalikan (hasil per operasi, memori per program per skala)."""
+    results, memory = {}, {}
+    for scale in scales:
+        # Selalu memakai folder sementara: pengukuran tanpa cache menghapus cache Feather di samping file data,
+        # sehingga data/ asli (dan cache dashboard yang sedang berjalan) tidak boleh dipakai langsung
+        tmp_dir = tempfile.mkdtemp(prefix=f"ydsf_bench_{scale}x_")
+        try:
+            if scale == 1:
+                data_files = copy_data_files(DATA_FILES, tmp_dir)
+            else:
+                data_files = synthetic_data_files(scale, tmp_dir)
+            # Pastikan cache Feather sudah ada agar load_* mengukur jalur normal (bukan konversi pertama)
+            for file_path in data_files.values():
+                DataStore({'x': file_path}).get('x')
+            memory[f"{scale}x"] = memory_footprint(data_files)
+            for program, sizes in memory[f"{scale}x"].items():
+                raw = f"{sizes['raw_mb']:.1f} MB" if sizes['raw_mb'] is not None else "-"
+                print(f"{f'memori[{program}]@{scale}x':<55} mentah {raw:>10}   padat {sizes['compact_mb']:>8.1f} MB",
+                      file=sys.stderr)
+            for name, func, setup in benchmark_operations(data_files):
+                key = f"{name}@{scale}x"
+                results[key] = measure(func, repeat, setup)
+                print(f"{key:<55} p50 {results[key]['p50_ms']:>10.1f} ms   "
+                      f"p90 {results[key]['p90_ms']:>10.1f} ms   peak {results[key]['peak_mb']:>8.1f} MB", file=sys.stderr)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    return results, memory
+
+
+def compare_with_baseline(results, baseline, threshold):
+    """Mencetak perbandingan p50/peak dengan baseline; mengembalikan daftar operasi yang melambat."""
+    regressions = []
+    print(f"\n{'Operasi':<55} {'p50 lama':>10} {'p50 baru':>10} {'rasio':>7} {'peak rasio':>11}")
+    for key, current in results.items():
+        previous = baseline.get('results', {}).get(key)
+        if previous is None:
+            print(f"{key:<55} {'-':>10} {current['p50_ms']:>10.1f} {'baru':>7}")
+            continue
+        ratio = current['p50_ms'] / previous['p50_ms'] if previous['p50_ms'] else float('inf')
+        peak_ratio = current['peak_mb'] / previous['peak_mb'] if previous['peak_mb'] else float('inf')
+        flag = "  <-- LEBIH LAMBAT" if ratio > threshold or peak_ratio > threshold else ""
+        print(f"{key:<55} {previous['p50_ms']:>10.1f} {current['p50_ms']:>10.1f} {ratio:>7.2f} {peak_ratio:>11.2f}{flag}")
+        if flag:
+            regressions.append(key)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark lapisan data dashboard YDSF.")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1], help="Faktor ukuran data (1 = data asli), misal 1 10 100")
+    parser.add_argument('--repeat', type=int, default=5, help="Jumlah pengulangan per operasi")
+    parser.add_argument('--output', help="Simpan hasil lengkap ke file JSON")
+    parser.add_argument('--save-baseline', help="Simpan hasil sebagai baseline ke file JSON")
+    parser.add_argument('--baseline', help="Bandingkan dengan baseline dari file JSON")
+    parser.add_argument('--threshold', type=float, default=1.25, help="Rasio (baru/lama) yang dianggap regresi")
+    args = parser.parse_args(argv)
+
+    results, memory = run_benchmarks(args.scales, args.repeat)
+    report = {
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'machine': platform.platform(),
+        'results': results,
+        'memory': memory,
+    }
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Hasil disimpan ke {path}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} operasi melambat lebih dari {args.threshold:.2f}x dibanding baseline.")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
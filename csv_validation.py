@@ -0,0 +1,366 @@
+"""Validasi file data program (xlsx atau CSV) sebelum dimuat dashboard.
+
+Baris CSV dengan jumlah kolom yang salah dipindahkan ke file karantina (beserta nomor barisnya) alih-alih
+menggagalkan seluruh file; nilai angka yang tidak bisa dibaca dilaporkan lalu dijadikan kosong (NaN).
+
+Jalankan langsung untuk memeriksa semua file program (dan file delta-nya) sekaligus:
+    python csv_validation.py [file.xlsx|file.csv ...]
+"""
+import csv
+import logging
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+# python-calamine (opsional) membaca xlsx jauh lebih cepat; tanpa itu dipakai openpyxl
+try:
+    import python_calamine
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    python_calamine = None
+    EXCEL_ENGINE = 'openpyxl'
+
+logger = logging.getLogger(__name__)
+
+EXCEL_EXTENSIONS = ('.xlsx',)
+# Format file CSV hasil ekspor dari Excel
+CSV_SEPARATOR = ';'
+CSV_ENCODING = 'latin1'
+# Kolom wajib pada setiap file program, sesuai urutan ekspor
+EXPECTED_COLUMNS = ['NIDS', 'KTP/SIM', 'Nama Penerima', 'Kota', 'Kat. Subprogram', 'Sumber Anggaran',
+                    'Jumlah Bantuan', 'Durasi Total', 'Cluster', 'Tahun']
+# Kolom yang harus berisi angka; isian lain dilaporkan sebagai kegagalan konversi
+NUMERIC_COLUMNS = ['NIDS', 'Jumlah Bantuan', 'Durasi Total', 'Cluster', 'Tahun']
+# Jumlah baris yang diproses per potongan (membatasi memori saat file besar)
+CHUNK_ROWS = 50_000
+# Isian sepanjang ini atau lebih dianggap rusak (biasanya tanda kutip yang tidak tertutup)
+MAX_FIELD_CHARS = 1_000
+# Subfolder (di samping file sumber) untuk baris yang dikarantina: <nama file>.csv
+QUARANTINE_DIR_NAME = "quarantine"
+# Jumlah contoh per jenis masalah yang dicetak di laporan
+REPORT_EXAMPLES = 5
+
+
+class CsvValidationError(ValueError):
+    """File data tidak bisa dipakai sama sekali (kosong atau kolom wajib tidak ada)."""
+
+
+def is_excel(file_path):
+    return file_path.lower().endswith(EXCEL_EXTENSIONS)
+
+
+def _check_columns(file_path, header, report):
+    missing = [col for col in EXPECTED_COLUMNS if col not in header]
+    if missing:
+        hint = "" if is_excel(file_path) else f" (pemisah kolom harus '{CSV_SEPARATOR}')"
+        raise CsvValidationError(f"{file_path}: kolom wajib tidak ditemukan: {', '.join(missing)}{hint}.")
+    report['extra_columns'] = [col for col in header if col not in EXPECTED_COLUMNS]
+
+
+def _log_problems(report):
+    if report['bad_rows'] or report['coercion_failures']:
+        logger.warning("%s: %d baris dikarantina, %d nilai angka tidak valid", report['file'], len(report['bad_rows']),
+                       sum(len(failures) for failures in report['coercion_failures'].values()))
+
+
+def _coerce_chunk(df, line_numbers, report):
+    """Mengonversi kolom angka satu potongan data; isian yang gagal dikonversi dicatat beserta nomor barisnya."""
+    for col in NUMERIC_COLUMNS:
+        values = pd.to_numeric(df[col], errors='coerce')
+        failed = (values.isna() & df[col].notna()).to_numpy()
+        if failed.any():
+            report['coercion_failures'].setdefault(col, []).extend(
+                (int(line), str(value)) for line, value in zip(line_numbers[failed], df[col][failed]))
+        df[col] = values
+    return df
+
+
+def _quarantine_path(file_path):
+    return os.path.join(os.path.dirname(file_path), QUARANTINE_DIR_NAME, os.path.basename(file_path))
+
+
+def _write_quarantine(file_path, header, bad_rows):
+    """Menyimpan baris bermasalah ke file karantina; file karantina lama dihapus bila kini tidak ada masalah."""
+    quarantine_path = _quarantine_path(file_path)
+    try:
+        if not bad_rows:
+            if os.path.exists(quarantine_path):
+                os.remove(quarantine_path)
+            return None
+        os.makedirs(os.path.dirname(quarantine_path), exist_ok=True)
+        with open(quarantine_path, 'w', encoding=CSV_ENCODING, newline='') as f:
+            writer = csv.writer(f, delimiter=CSV_SEPARATOR)
+            writer.writerow(['Baris File', 'Masalah'] + header)
+            for row in bad_rows:
+                writer.writerow([row['line'], row['problem']] + row['fields'])
+    except OSError:
+        # Folder data read-only: masalah tetap tercatat di laporan dan log
+        return None
+    return quarantine_path
+
+
+class _LineSource:
+    """Iterator baris fisik file untuk csv.reader yang mencatat baris yang dipakai satu record.
+
+    Baris yang dikembalikan lewat push_back dibaca lagi lebih dulu, sehingga sisa baris yang "tertelan"
+    tanda kutip tidak tertutup bisa dipindai ulang sebagai record tersendiri.
+    """
+
+    def __init__(self, f):
+        self._f = f
+        self._pending = deque()
+        self.consumed = []
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self._pending.popleft() if self._pending else next(self._f)
+        self.consumed.append(line)
+        return line
+
+    def push_back(self, lines):
+        self._pending.extendleft(reversed(lines))
+
+
+class _SkipLines:
+    """Objek file (hanya read) yang melewati nomor baris fisik tertentu, untuk parser C pandas.
+
+    Dipakai bila ada baris rusak: skiprows pandas tetap memperhatikan tanda kutip pada baris yang dilewati,
+    sehingga satu tanda kutip tidak tertutup akan ikut melewati semua baris sesudahnya.
+    """
+
+    def __init__(self, f, skip):
+        self._lines = (line for number, line in enumerate(f, 1) if number not in skip)
+        self._buffer = ''
+
+    def read(self, size=-1):
+        parts, length = [self._buffer], len(self._buffer)
+        while size < 0 or length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            parts.append(line)
+            length += len(line)
+        data = ''.join(parts)
+        if size < 0:
+            self._buffer = ''
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def iter_validated_csv(file_path, report=None, chunk_size=CHUNK_ROWS, quarantine=True):
+    """Membaca satu CSV program per potongan (maksimal chunk_size baris) sambil memvalidasinya.
+
+    Menghasilkan potongan DataFrame berisi baris yang valid; hasil validasi dicatat ke `report` (dict dari
+    new_report). Nomor baris di laporan adalah nomor baris pada file (header = baris 1).
+    """
+    if report is None:
+        report = new_report(file_path)
+    # Tahap 1: memindai struktur baris (jumlah kolom) dengan csv.reader, tanpa membuat DataFrame
+    line_numbers = []
+    with open(file_path, encoding=CSV_ENCODING, newline='') as f:
+        lines = _LineSource(f)
+        reader = csv.reader(lines, delimiter=CSV_SEPARATOR)
+        header = next(reader, None)
+        if header is None:
+            raise CsvValidationError(f"{file_path}: file kosong.")
+        _check_columns(file_path, header, report)
+
+        line = len(lines.consumed) + 1
+        while True:
+            lines.consumed = []
+            fields = next(reader, None)
+            if fields is None:
+                break
+            problem = None
+            if len(fields) != len(header):
+                if fields:  # baris kosong diabaikan, sama seperti pd.read_csv
+                    problem = f"{len(fields)} kolom, seharusnya {len(header)}"
+            # Panjang record dicek dulu agar panjang setiap isian hanya dihitung pada record yang sangat panjang
+            elif sum(map(len, lines.consumed)) >= MAX_FIELD_CHARS and max(map(len, fields)) >= MAX_FIELD_CHARS:
+                problem = f"isian lebih dari {MAX_FIELD_CHARS} karakter"
+
+            if problem and len(lines.consumed) > 1:
+                # Record tidak valid yang melewati beberapa baris fisik: tanda kutip tidak tertutup. Hanya baris
+                # pertamanya yang dikarantina; baris-baris berikutnya dipindai ulang sebagai record biasa.
+                # (Record valid dengan isian berisi baris baru, misal Alt+Enter di Excel, tetap diterima.)
+                lines.push_back(lines.consumed[1:])
+                del lines.consumed[1:]
+                fields = next(csv.reader([lines.consumed[0].rstrip('\r\n')], delimiter=CSV_SEPARATOR), [])
+                problem = 'tanda kutip (") tidak tertutup'
+
+            if problem:
+                report['bad_rows'].append({'line': line, 'problem': problem, 'fields': fields})
+            elif fields:
+                line_numbers.append(line)
+            line += len(lines.consumed)
+    line_numbers = np.array(line_numbers, dtype=np.int64)
+
+    # Tahap 2: parsing per potongan dengan parser C pandas, melewati baris yang dikarantina
+    # KTP/SIM selalu dibaca sebagai teks; file kecil yang isinya angka semua bisa terbaca sebagai float
+    with open(file_path, encoding=CSV_ENCODING, newline='') as f:
+        bad_lines = {row['line'] for row in report['bad_rows']}
+        source = _SkipLines(f, bad_lines) if bad_lines else f
+        with pd.read_csv(source, sep=CSV_SEPARATOR, dtype={'KTP/SIM': str}, chunksize=chunk_size) as chunk_reader:
+            for chunk in chunk_reader:
+                start = report['rows']
+                report['rows'] += len(chunk)
+                yield _coerce_chunk(chunk, line_numbers[start:start + len(chunk)], report)
+
+    if quarantine:
+        report['quarantine'] = _write_quarantine(file_path, header, report['bad_rows'])
+    _log_problems(report)
+
+
+def new_report(file_path):
+    """Laporan validasi kosong untuk satu file."""
+    return {'file': file_path, 'rows': 0, 'bad_rows': [], 'coercion_failures': {},
+            'extra_columns': [], 'quarantine': None}
+
+
+def read_validated_csv(file_path, chunk_size=CHUNK_ROWS, quarantine=True):
+    """Membaca dan memvalidasi satu CSV program; mengembalikan (DataFrame baris valid, laporan validasi)."""
+    report = new_report(file_path)
+    chunks = list(iter_validated_csv(file_path, report, chunk_size, quarantine))
+    df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    return df, report
+
+
+def _excel_cell(value):
+    """Menyeragamkan nilai sel seperti pd.read_excel: sel kosong menjadi '' dan bilangan bulat float menjadi int."""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _iter_excel_rows(file_path):
+    """Baris-baris sheet pertama file xlsx (daftar nilai sel), dibaca bertahap tanpa membuat DataFrame utuh."""
+    try:
+        if python_calamine is not None:
+            workbook = python_calamine.CalamineWorkbook.from_path(file_path)
+            try:
+                yield from workbook.get_sheet_by_index(0).iter_rows()
+            finally:
+                workbook.close()
+        else:
+            import openpyxl
+            workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                yield from workbook.worksheets[0].iter_rows(values_only=True)
+            finally:
+                workbook.close()
+    except OSError:
+        raise
+    except Exception as e:
+        # File rusak atau belum selesai disalin (BadZipFile, CalamineError, InvalidFileException, ...)
+        raise CsvValidationError(f"{file_path}: file xlsx tidak bisa dibaca ({type(e).__name__}: {e}).") from e
+
+
+def iter_validated_xlsx(file_path, report=None, chunk_size=CHUNK_ROWS):
+    """Membaca sheet pertama file xlsx program per potongan (maksimal chunk_size baris) sambil memvalidasinya.
+
+    Setiap potongan diurai dengan aturan yang sama seperti pd.read_excel (nilai kosong/NA, tipe kolom, KTP/SIM
+    sebagai teks), sehingga hanya satu potongan baris yang ada sebagai objek Python dalam satu waktu.
+    """
+    if report is None:
+        report = new_report(file_path)
+    rows = _iter_excel_rows(file_path)
+    header = next(rows, None)
+    if header is None:
+        raise CsvValidationError(f"{file_path}: file kosong.")
+    header = [str(name) if name not in (None, '') else f"Unnamed: {i}" for i, name in enumerate(header)]
+    _check_columns(file_path, header, report)
+
+    first_line = 2  # baris data pertama = baris 2 di sheet
+    while True:
+        block = [[_excel_cell(value) for value in row] for row in islice(rows, chunk_size)]
+        if not block:
+            break
+        line_numbers = np.arange(first_line, first_line + len(block))
+        first_line += len(block)
+        df = TextParser(block, names=header, header=None, dtype={'KTP/SIM': str}).read()
+        # Baris yang seluruhnya kosong (sisa format di Excel) diabaikan
+        filled = df.notna().any(axis=1).to_numpy()
+        if not filled.all():
+            df, line_numbers = df[filled].reset_index(drop=True), line_numbers[filled]
+        if df.empty:
+            continue
+        report['rows'] += len(df)
+        yield _coerce_chunk(df, line_numbers, report)
+    _log_problems(report)
+
+
+def read_validated_xlsx(file_path, chunk_size=CHUNK_ROWS):
+    """Membaca sheet pertama file xlsx program dan memvalidasi kolom angkanya; mengembalikan (DataFrame, laporan)."""
+    report = new_report(file_path)
+    # Sheet yang hanya berisi header menghasilkan DataFrame kosong, sama seperti pd.read_excel
+    chunks = list(iter_validated_xlsx(file_path, report, chunk_size)) or [pd.DataFrame(columns=EXPECTED_COLUMNS)]
+    df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    return df, report
+
+
+def read_validated_file(file_path):
+    """read_validated_xlsx atau read_validated_csv sesuai ekstensi file."""
+    return read_validated_xlsx(file_path) if is_excel(file_path) else read_validated_csv(file_path)
+
+
+def validate_file(file_path):
+    """Seperti read_validated_file, tetapi hanya mengembalikan laporannya."""
+    try:
+        return read_validated_file(file_path)[1]
+    except (OSError, CsvValidationError) as e:
+        return {'file': file_path, 'error': str(e)}
+
+
+def validate_files(file_paths, max_workers=None):
+    """Memvalidasi beberapa file sekaligus di proses terpisah; urutan laporan sama dengan file_paths."""
+    file_paths = list(file_paths)
+    if len(file_paths) <= 1:
+        return [validate_file(path) for path in file_paths]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(validate_file, file_paths))
+
+
+def format_report(report):
+    """Ringkasan laporan validasi satu file dalam bentuk teks."""
+    if 'error' in report:
+        return f"❌ {report['error']}"
+    lines = [f"{'✅' if not (report['bad_rows'] or report['coercion_failures']) else '🔴'} "
+             f"{report['file']}: {report['rows']} baris valid"]
+    if report['extra_columns']:
+        lines.append(f"   Kolom tambahan (diabaikan pemeriksaan): {', '.join(report['extra_columns'])}")
+    if report['bad_rows']:
+        lines.append(f"   {len(report['bad_rows'])} baris dikarantina"
+                     + (f" ke {report['quarantine']}" if report['quarantine'] else ""))
+        for row in report['bad_rows'][:REPORT_EXAMPLES]:
+            lines.append(f"   -> baris {row['line']}: {row['problem']}: {CSV_SEPARATOR.join(row['fields'])[:120]}")
+    for col, failures in report['coercion_failures'].items():
+        lines.append(f"   {len(failures)} nilai '{col}' bukan angka (dijadikan kosong)")
+        for line, value in failures[:REPORT_EXAMPLES]:
+            lines.append(f"   -> baris {line}: {value!r}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    from data_store import DATA_FILES, delta_files
+
+    file_paths = argv if argv else [path for file_path in DATA_FILES.values() for path in [file_path] + delta_files(file_path)]
+    reports = validate_files(file_paths)
+    for report in reports:
+        print(format_report(report))
+    has_problem = any('error' in report or report['bad_rows'] or report['coercion_failures'] for report in reports)
+    return 1 if has_problem else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
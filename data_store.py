@@ -0,0 +1,588 @@
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+from aggregates import CUBE_COLUMNS, PROFILE_SOURCE_COLUMNS, ClusterProfile, build_cube, merge_cubes
+from csv_validation import (CHUNK_ROWS, EXPECTED_COLUMNS, CsvValidationError, is_excel, iter_validated_csv,
+                            iter_validated_xlsx)
+from search_index import RecipientIndex, SearchIndex
+
+# pyarrow bersifat opsional: tanpa pyarrow, data tetap dibaca langsung dari CSV
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+logger = logging.getLogger(__name__)
+
+# Copy-on-Write membuat potongan baris/kolom tidak menyalin data; sudah default sejak pandas 3.0
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+# --- LOKASI DATA ---
+# File xlsx adalah sumber data utama; file .csv (pemisah ';', latin1) juga diterima
+DATA_FILES = {
+    "Dakwah": "data/program_dakwah.xlsx",
+    "Kemanusiaan": "data/program_kemanusiaan.xlsx",
+    "Masjid": "data/program_masjid.xlsx",
+    "Pendidikan": "data/program_pendidikan.xlsx",
+    "Zakat": "data/program_zakat.xlsx",
+    "Yatim": "data/program_yatim.xlsx",
+}
+
+# Subfolder (di samping file program) untuk file tambahan (delta) bulanan: <nama file program>_<periode>.xlsx
+# atau .csv, misal data/delta/program_yatim_2025-09.xlsx, dengan kolom yang sama seperti file program
+DELTA_DIR_NAME = "delta"
+# Jeda minimum (detik) antar pengecekan file delta/sumber yang berubah
+REFRESH_INTERVAL = 60
+# Jumlah proses untuk konversi xlsx/CSV yang belum ada cache-nya (parsing xlsx terikat GIL) dan jumlah thread
+# untuk membaca cache Feather beberapa program sekaligus (pembacaan Arrow di luar GIL)
+LOAD_WORKERS = min(8, os.cpu_count() or 1)
+# Konversi di proses terpisah hanya bila total ukuran file yang usang sebesar ini: setiap proses baru perlu
+# ±0,8 detik untuk impor pandas, sedangkan xlsx dibaca sekitar 3 MB per detik per core
+PROCESS_CONVERT_MIN_BYTES = 8 * 1024 ** 2
+
+# Subfolder (di samping file sumber) untuk hasil konversi xlsx/CSV ke format kolumnar (Feather/Arrow IPC)
+CACHE_DIR_NAME = ".cache"
+# Naikkan angka ini setiap kali skema hasil konversi berubah agar cache lama dibuat ulang
+CACHE_VERSION = 3
+
+# Kolom teks dengan sedikit nilai unik disimpan sebagai kategori (kode integer + kamus)
+CATEGORICAL_COLUMNS = ['Kota', 'Kat. Subprogram', 'Sumber Anggaran']
+# Kolom integer yang boleh diperkecil tipenya (int8/int16/int32)
+INTEGER_COLUMNS = ['NIDS', 'Jumlah Bantuan', 'Durasi Total', 'Cluster', 'Tahun']
+# Kolom teks dengan banyak nilai unik; KTP/SIM tidak selalu berupa angka sehingga tetap string
+STRING_COLUMNS = ['KTP/SIM', 'Nama Penerima']
+STRING_DTYPE = pd.StringDtype('pyarrow') if feather is not None else pd.StringDtype()
+
+
+def compact_dtypes(df):
+    """Mengubah tipe kolom menjadi skema hemat memori (kategori, integer kecil, string)."""
+    df = df.copy()
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    for col in INTEGER_COLUMNS:
+        # Kolom yang berisi NaN (hasil coerce) dibiarkan float64 agar nominal besar tidak kehilangan presisi
+        if col in df.columns and df[col].notna().all():
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+    for col in STRING_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(STRING_DTYPE)
+    return df
+
+
+def memory_mb(df):
+    """Ukuran DataFrame di memori (MB), termasuk isi string."""
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def _compact_chunks(file_path, chunks, stats=None):
+    """Memadatkan tipe setiap potongan hasil validasi lalu menggabungkannya.
+
+    Ukuran memori sebelum dan sesudah pemadatan (MB) dicatat ke `stats` (dict) bila diberikan.
+    """
+    # Tipe dipadatkan per potongan agar teks mentah hanya ada untuk satu potongan dalam satu waktu
+    raw_mb, compact = 0.0, []
+    for chunk in chunks:
+        raw_mb += memory_mb(chunk)
+        compact.append(compact_dtypes(chunk))
+    if not compact:
+        compact = [compact_dtypes(pd.DataFrame(columns=EXPECTED_COLUMNS))]
+    compact_df = pd.concat(_unify_categories(compact), ignore_index=True) if len(compact) > 1 else compact[0]
+    compact_mb = memory_mb(compact_df)
+    logger.info("%s: memori %.2f MB -> %.2f MB setelah pemadatan tipe", file_path, raw_mb, compact_mb)
+    if stats is not None:
+        stats.update(raw_mb=raw_mb, compact_mb=compact_mb)
+    return compact_df
+
+
+def read_program_csv(file_path, chunk_size=CHUNK_ROWS, stats=None):
+    """Membaca dan memvalidasi satu file CSV program per potongan (lihat csv_validation.py), lalu memadatkan tipenya."""
+    # Baris rusak dikarantina dan nilai angka tidak valid dijadikan NaN, sehingga satu baris tidak menggagalkan file.
+    return _compact_chunks(file_path, iter_validated_csv(file_path, chunk_size=chunk_size), stats)
+
+
+def read_program_xlsx(file_path, chunk_size=CHUNK_ROWS, stats=None):
+    """Membaca dan memvalidasi sheet pertama file xlsx program per potongan, lalu memadatkan tipenya."""
+    return _compact_chunks(file_path, iter_validated_xlsx(file_path, chunk_size=chunk_size), stats)
+
+
+def read_program_file(file_path, stats=None):
+    """Membaca satu file program (xlsx atau CSV) sesuai ekstensinya."""
+    if is_excel(file_path):
+        return read_program_xlsx(file_path, stats=stats)
+    return read_program_csv(file_path, stats=stats)
+
+
+def file_hash(file_path):
+    """Menghitung hash SHA-256 isi file secara bertahap."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cache_paths(file_path):
+    cache_dir = os.path.join(os.path.dirname(file_path), CACHE_DIR_NAME)
+    # Nama file lengkap (dengan ekstensi) agar program_x.xlsx dan program_x.csv tidak berbagi cache
+    nama = os.path.basename(file_path)
+    return os.path.join(cache_dir, f"{nama}.feather"), os.path.join(cache_dir, f"{nama}.json")
+
+
+def _write_json_atomic(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _is_cache_fresh(file_path, cache_path, meta_path):
+    """Cek apakah cache masih sesuai dengan file sumber (mtime dulu, lalu hash)."""
+    if not (os.path.exists(cache_path) and os.path.exists(meta_path)):
+        return False
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if meta.get('version') != CACHE_VERSION:
+        return False
+
+    stat = os.stat(file_path)
+    if meta.get('mtime_ns') == stat.st_mtime_ns and meta.get('size') == stat.st_size:
+        return True
+
+    # mtime berubah (misal file disalin ulang) tetapi isinya bisa saja sama
+    if meta.get('sha256') != file_hash(file_path):
+        return False
+    meta.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+    try:
+        _write_json_atomic(meta_path, meta)
+    except OSError:
+        pass
+    return True
+
+
+def build_cache(file_path):
+    """Mengonversi satu file program menjadi file Feather bertipe dan mengembalikan DataFrame-nya."""
+    stats = {}
+    df = read_program_file(file_path, stats)
+    if feather is None:
+        return df
+
+    cache_path, meta_path = _cache_paths(file_path)
+    stat = os.stat(file_path)
+    meta = {
+        'version': CACHE_VERSION,
+        'source': file_path,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': file_hash(file_path),
+        # Ukuran di memori sebelum/sesudah pemadatan tipe, ditampilkan di panel debug (DataStore.memory_report)
+        'memory_mb': stats,
+    }
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        # Tulis ke file sementara lalu ganti, agar worker lain tidak membaca file setengah jadi
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        # Tanpa kompresi supaya file bisa di-memory-map saat dibaca
+        feather.write_feather(df, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, cache_path)
+        _write_json_atomic(meta_path, meta)
+    except OSError:
+        # Folder data read-only: tetap kembalikan hasil parsing file sumber
+        pass
+    return df
+
+
+def _build_cache_quietly(file_path):
+    """build_cache untuk worker proses: DataFrame tidak dikirim balik, error dilaporkan lagi oleh proses utama."""
+    try:
+        build_cache(file_path)
+    except (OSError, CsvValidationError):
+        pass
+
+
+def _needs_cache(file_path):
+    try:
+        return not _is_cache_fresh(file_path, *_cache_paths(file_path))
+    except OSError:
+        # File hilang: error-nya muncul saat file dimuat
+        return False
+
+
+def build_caches(file_paths, max_workers=None):
+    """Membuat cache Feather yang usang untuk beberapa file sekaligus di proses terpisah.
+
+    Parsing xlsx sebagian besar berupa kode Python yang memegang GIL, sehingga thread tidak menambah kecepatan;
+    setiap proses menulis hasilnya ke Feather, lalu proses utama cukup me-memory-map file tersebut.
+    """
+    max_workers = max_workers or LOAD_WORKERS
+    if feather is None or max_workers <= 1:
+        return
+    stale = [path for path in file_paths if _needs_cache(path)]
+    if len(stale) <= 1 or sum(os.path.getsize(path) for path in stale) < PROCESS_CONVERT_MIN_BYTES:
+        return
+    # spawn: proses dashboard sudah menjalankan banyak thread, sehingga fork tidak aman
+    try:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(stale)),
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            list(executor.map(_build_cache_quietly, stale))
+    except BrokenProcessPool as e:
+        # File yang belum terkonversi tetap dibaca langsung oleh proses utama
+        logger.warning("Konversi cache paralel gagal: %s", e)
+
+
+def load_program_frame(file_path, columns=None):
+    """Memuat data satu program (hanya kolom `columns` bila diisi) dari cache kolumnar, membuat ulang cache bila usang."""
+    if feather is None:
+        df = read_program_file(file_path)
+        return df if columns is None else df[list(columns)]
+
+    cache_path, meta_path = _cache_paths(file_path)
+    if not _is_cache_fresh(file_path, cache_path, meta_path):
+        df = build_cache(file_path)
+        return df if columns is None else df[list(columns)]
+    # Format kolumnar: kolom yang tidak diminta tidak dibaca sama sekali
+    return feather.read_table(cache_path, columns=columns, memory_map=True).to_pandas()
+
+
+def delta_files(file_path):
+    """Daftar file delta (terurut nama) milik satu file program."""
+    delta_dir = os.path.join(os.path.dirname(file_path), DELTA_DIR_NAME)
+    prefix = os.path.splitext(os.path.basename(file_path))[0] + '_'
+    try:
+        names = sorted(os.listdir(delta_dir))
+    except FileNotFoundError:
+        return []
+    return [os.path.join(delta_dir, name) for name in names
+            if name.startswith(prefix) and (name.endswith('.csv') or is_excel(name))]
+
+
+def read_delta_files(paths, columns=None):
+    """Membaca beberapa file delta; mengembalikan (daftar DataFrame, daftar file yang berhasil dibaca).
+
+    File delta yang rusak dicatat ke log lalu dilewati tanpa menghentikan dashboard; karena tidak ikut
+    tercatat sebagai sudah dimuat, file itu dicoba lagi pada refresh berikutnya.
+    """
+    frames, loaded = [], []
+    for path in paths:
+        try:
+            frames.append(load_program_frame(path, columns))
+        except CsvValidationError as e:
+            logger.error("File delta dilewati: %s", e)
+            continue
+        loaded.append(path)
+    return frames, loaded
+
+
+def _unify_categories(frames):
+    """Menyamakan daftar kategori antar program agar pd.concat tetap menghasilkan kolom kategori."""
+    for col in CATEGORICAL_COLUMNS:
+        if not all(col in frame and isinstance(frame[col].dtype, pd.CategoricalDtype) for frame in frames):
+            continue
+        # Kategori diurutkan seperti hasil astype('category') pada data utuh
+        categories = pd.api.types.union_categoricals([frame[col] for frame in frames], sort_categories=True).categories
+        if all(frame[col].cat.categories.equals(categories) for frame in frames):
+            continue
+        frames = [frame.assign(**{col: frame[col].cat.set_categories(categories)}) for frame in frames]
+    return frames
+
+
+class DataStore:
+    """Menyimpan satu salinan data per program; gabungan semua program dibentuk dari salinan yang sama.
+
+    File delta di subfolder DELTA_DIR_NAME ditambahkan ke data yang sudah dimuat lewat refresh(), tanpa membaca
+    ulang file program; indeks pencarian dan kubus agregat ikut diperbarui hanya dengan baris baru.
+    """
+
+    def __init__(self, data_files=None):
+        self.data_files = dict(data_files or DATA_FILES)
+        # Bertambah setiap kali isi data berubah (dipakai sebagai bagian kunci cache turunan)
+        self.version = 0
+        self._frames = {}
+        # Data program yang baru dimuat sebagian kolomnya (untuk kubus/profil), sebelum data lengkapnya dibutuhkan
+        self._partial = {}
+        self._source_mtimes = {}
+        self._applied_deltas = {}
+        self._last_refresh = time.monotonic()
+        self._combined = None
+        self._cubes = {}
+        self._cluster_profiles = {}
+        self._search_indexes = {}
+        # Urutan baris per program untuk pengurutan tabel: {program: {(kolom, naik): posisi baris}}
+        self._sort_orders = {}
+        self._recipient_index = None
+        self._lock = threading.RLock()
+
+    def get(self, program_name, columns=None):
+        """Mengembalikan data satu program, memuatnya sekali saja bila belum ada.
+
+        Bila `columns` diisi dan data lengkap belum dimuat, hanya kolom tersebut yang dibaca dari cache.
+        """
+        with self._lock:
+            if program_name in self._frames:
+                frame = self._frames[program_name]
+                return frame if columns is None else frame[list(columns)]
+            if columns is None:
+                self._store(program_name, self._load(program_name))
+                return self._frames[program_name]
+
+            loaded_columns = self._missing_columns(program_name, columns)
+            if loaded_columns is not None:
+                self._store(program_name, self._load(program_name, loaded_columns), loaded_columns)
+            return self._partial[program_name][list(columns)]
+
+    def _missing_columns(self, program_name, columns):
+        """Kolom yang perlu dibaca agar data sebagian `program_name` memuat `columns`; None bila sudah lengkap."""
+        partial = self._partial.get(program_name)
+        if partial is not None and all(col in partial for col in columns):
+            return None
+        # Kolom lama ikut dibaca ulang (murah dari cache) agar semua kolom berasal dari baris yang sama
+        return list(dict.fromkeys(list(partial.columns if partial is not None else []) + list(columns)))
+
+    def _load(self, program_name, columns=None):
+        """Membaca file program beserta file delta-nya (tanpa mengubah isi store, aman dijalankan di thread lain)."""
+        file_path = self.data_files[program_name]
+        mtime = os.stat(file_path).st_mtime_ns
+        # Delta yang sudah tercatat (dari pemuatan sebagian kolom) dipakai lagi agar isinya sama dengan kubus/profil
+        # yang sudah dibangun; delta yang lebih baru menyusul lewat refresh()
+        applied = self._applied_deltas.get(program_name)
+        deltas = sorted(applied) if applied is not None else delta_files(file_path)
+        frame = load_program_frame(file_path, columns)
+        delta_frames, deltas = read_delta_files(deltas, columns)
+        if delta_frames:
+            frame = pd.concat(_unify_categories([frame] + delta_frames), ignore_index=True)
+        return frame, mtime, deltas
+
+    def _store(self, program_name, loaded, columns=None):
+        """Menyimpan hasil _load sebagai data lengkap (atau data sebagian bila `columns` diisi).
+
+        Semua jalur pemuatan lewat sini: bila file sumber sudah diganti sejak kubus/profil/indeks dibangun, semua
+        turunannya dibuang lebih dulu dan file dibaca ulang, sehingga data baru tidak bercampur dengan turunan lama.
+        """
+        if loaded[1] != self._source_mtimes.get(program_name, loaded[1]):
+            self._reset(program_name)
+            self.version += 1
+            # Dibaca ulang karena delta yang dipakai _load mengikuti catatan file lama
+            loaded = self._load(program_name, columns)
+        frame, mtime, deltas = loaded
+        if columns is None:
+            self._frames[program_name] = frame
+            self._partial.pop(program_name, None)
+        else:
+            self._partial[program_name] = frame
+        self._record(program_name, mtime, deltas)
+
+    def _record(self, program_name, mtime, deltas):
+        # Catatan pemuatan pertama dipertahankan; perubahan file sesudahnya dideteksi oleh refresh()
+        self._source_mtimes.setdefault(program_name, mtime)
+        self._applied_deltas.setdefault(program_name, set(deltas))
+
+    def load_all(self, columns=None, max_workers=None):
+        """Memuat semua program yang belum ada di memori secara paralel (hanya kolom `columns` bila diisi).
+
+        max_workers bawaan: LOAD_WORKERS.
+        """
+        max_workers = max_workers or LOAD_WORKERS
+        with self._lock:
+            # program -> kolom yang dibaca (None = data lengkap)
+            missing = {}
+            for program in self.data_files:
+                if program in self._frames:
+                    continue
+                loaded_columns = None if columns is None else self._missing_columns(program, columns)
+                if columns is None or loaded_columns is not None:
+                    missing[program] = loaded_columns
+            if len(missing) > 1 and max_workers > 1:
+                # Cache yang usang dibuat dulu di proses terpisah; thread di bawah lalu hanya membaca Feather
+                build_caches([path for program in missing
+                              for path in [self.data_files[program]] + delta_files(self.data_files[program])],
+                             max_workers)
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as executor:
+                    results = executor.map(self._load, missing, missing.values())
+                    for (program, loaded_columns), loaded in zip(missing.items(), results):
+                        self._store(program, loaded, loaded_columns)
+            for program in missing:
+                self.get(program, columns)
+
+    def is_loaded(self, program_name=None):
+        """Apakah data satu program (atau gabungan, bila program_name None) sudah ada di memori."""
+        if program_name is None:
+            return self._combined is not None
+        return program_name in self._frames
+
+    def combined(self):
+        """Mengembalikan gabungan semua program dengan kolom tambahan 'program_nama'."""
+        with self._lock:
+            if self._combined is None:
+                programs = list(self.data_files)
+                self.load_all()
+                frames = [self.get(program) for program in programs]
+                frames = _unify_categories(frames)
+                frames = [
+                    frame.assign(program_nama=pd.Categorical([program] * len(frame), categories=programs))
+                    for program, frame in zip(programs, frames)
+                ]
+                combined = pd.concat(frames, ignore_index=True)
+
+                # Ganti data per program dengan potongan baris dari gabungan agar hanya ada satu
+                # salinan di memori (dengan Copy-on-Write, iloc/drop/reset_index tidak menyalin data)
+                start = 0
+                for program, frame in zip(programs, frames):
+                    stop = start + len(frame)
+                    self._frames[program] = (
+                        combined.iloc[start:stop].drop(columns=['program_nama']).reset_index(drop=True)
+                    )
+                    start = stop
+                self._combined = combined
+            return self._combined
+
+    def cube(self, program_name=None):
+        """Kubus agregat satu program, atau gabungan kubus semua program bila program_name None."""
+        with self._lock:
+            if program_name is None:
+                if None not in self._cubes:
+                    # Kolom kubus semua program dimuat paralel dulu; kubus per program lalu dibangun dari memori
+                    self.load_all(CUBE_COLUMNS)
+                    self._cubes[None] = pd.concat(
+                        [self.cube(program) for program in self.data_files], ignore_index=True
+                    )
+                return self._cubes[None]
+            if program_name not in self._cubes:
+                frame = self.get(program_name, CUBE_COLUMNS)
+                program_nama = pd.Categorical([program_name] * len(frame), categories=list(self.data_files))
+                self._cubes[program_name] = build_cube(frame.assign(program_nama=program_nama))
+            return self._cubes[program_name]
+
+    def cluster_profile(self, program_name):
+        """Profil semua cluster dan tahun untuk satu program, dihitung sekali saat pertama dipakai."""
+        with self._lock:
+            if program_name not in self._cluster_profiles:
+                self._cluster_profiles[program_name] = ClusterProfile(self.get(program_name, PROFILE_SOURCE_COLUMNS))
+            return self._cluster_profiles[program_name]
+
+    def search_index(self, program_name):
+        """Indeks pencarian Nama Penerima/KTP/SIM untuk satu program, dibangun saat pertama dipakai."""
+        with self._lock:
+            if program_name not in self._search_indexes:
+                self._search_indexes[program_name] = SearchIndex(self.get(program_name))
+            return self._search_indexes[program_name]
+
+    def memory_report(self):
+        """Ukuran memori data program yang sudah dimuat: sebelum pemadatan tipe (dari metadata cache) dan saat ini (MB)."""
+        with self._lock:
+            report = []
+            for program_name in self.data_files:
+                frame = self._frames.get(program_name, self._partial.get(program_name))
+                if frame is None:
+                    continue
+                raw_mb = None
+                if feather is not None:
+                    try:
+                        with open(_cache_paths(self.data_files[program_name])[1]) as f:
+                            raw_mb = json.load(f).get('memory_mb', {}).get('raw_mb')
+                    except (OSError, ValueError):
+                        pass
+                report.append({
+                    'program': program_name,
+                    'kolom dimuat': len(frame.columns),
+                    'MB sebelum pemadatan': raw_mb,
+                    'MB di memori': memory_mb(frame),
+                })
+            return report
+
+    def sort_order(self, program_name, column, ascending=True):
+        """Posisi baris satu program terurut menurut `column` (stabil, nilai kosong di akhir), dihitung sekali per kolom."""
+        with self._lock:
+            orders = self._sort_orders.setdefault(program_name, {})
+            if (column, ascending) not in orders:
+                values = self.get(program_name)[column].reset_index(drop=True)
+                orders[column, ascending] = values.sort_values(ascending=ascending, kind='stable').index.to_numpy()
+            return orders[column, ascending]
+
+    def recipient_index(self):
+        """Indeks KTP/SIM dan NIDS lintas program (posisi baris pada combined())."""
+        with self._lock:
+            if self._recipient_index is None:
+                self._recipient_index = RecipientIndex(self.combined())
+            return self._recipient_index
+
+    def refresh(self, force=False):
+        """Menambahkan file delta baru dan memuat ulang program yang file sumbernya diganti.
+
+        Pengecekan dibatasi sekali per REFRESH_INTERVAL detik kecuali force=True.
+        Mengembalikan daftar program yang berubah.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_refresh < REFRESH_INTERVAL:
+                return []
+            self._last_refresh = now
+
+            changed = []
+            for program_name in list(self._source_mtimes):
+                file_path = self.data_files[program_name]
+                if os.stat(file_path).st_mtime_ns != self._source_mtimes[program_name]:
+                    # File program diganti seluruhnya: buang semua turunan, dimuat ulang saat dibutuhkan
+                    self._reset(program_name)
+                    changed.append(program_name)
+                    continue
+                frames, new_deltas = read_delta_files(
+                    [path for path in delta_files(file_path) if path not in self._applied_deltas[program_name]])
+                if new_deltas:
+                    if program_name in self._frames:
+                        self._append(program_name, pd.concat(frames, ignore_index=True))
+                        self._applied_deltas[program_name].update(new_deltas)
+                    else:
+                        # Baru sebagian kolom yang dimuat: dimuat ulang (termasuk delta baru) saat dibutuhkan
+                        self._reset(program_name)
+                    changed.append(program_name)
+            if changed:
+                self.version += 1
+                logger.info("Data diperbarui untuk program: %s", ", ".join(changed))
+            return changed
+
+    def _reset(self, program_name):
+        for cache in (self._frames, self._partial, self._source_mtimes, self._applied_deltas,
+                      self._cubes, self._cluster_profiles, self._search_indexes, self._sort_orders):
+            cache.pop(program_name, None)
+        self._cubes.pop(None, None)
+        self._combined = None
+        self._recipient_index = None
+
+    def _append(self, program_name, delta):
+        """Menambahkan baris baru ke satu program beserta semua indeks/agregat yang sudah dibangun."""
+        frame, delta = _unify_categories([self._frames[program_name], delta])
+        self._frames[program_name] = pd.concat([frame, delta], ignore_index=True)
+
+        if program_name in self._search_indexes:
+            self._search_indexes[program_name].append(delta)
+        # Profil cluster dan urutan tabel murah dibuat ulang saat halamannya dibuka lagi
+        self._cluster_profiles.pop(program_name, None)
+        self._sort_orders.pop(program_name, None)
+
+        program_nama = pd.Categorical([program_name] * len(delta), categories=list(self.data_files))
+        delta = delta.assign(program_nama=program_nama)
+        if program_name in self._cubes:
+            self._cubes[program_name] = merge_cubes([self._cubes[program_name], build_cube(delta)])
+        self._cubes.pop(None, None)
+
+        if self._combined is not None:
+            # Baris baru diletakkan di akhir gabungan agar posisi baris lama (dan indeks KTP/NIDS) tetap berlaku.
+            # Data program yang diperbarui tidak lagi berbagi memori dengan gabungan sampai proses dimulai ulang.
+            offset = len(self._combined)
+            combined, delta = _unify_categories([self._combined, delta])
+            self._combined = pd.concat([combined, delta], ignore_index=True)
+            if self._recipient_index is not None:
+                self._recipient_index.append(self._combined, offset)
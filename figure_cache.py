@@ -0,0 +1,58 @@
+import threading
+from collections import OrderedDict
+
+# Jumlah maksimum grafik yang disimpan per proses sebelum yang paling lama tidak dipakai dibuang
+FIGURE_CACHE_SIZE = 256
+
+
+class FigureCache:
+    """Cache LRU untuk grafik Plotly (beserta nilai insight-nya), dengan penghitung hit/miss.
+
+    Kunci berisi semua filter yang memengaruhi grafik (halaman, nama grafik, program, tahun,
+    cluster, kota) ditambah versi data, sehingga grafik dibangun ulang hanya bila salah satunya berubah.
+    """
+
+    def __init__(self, maxsize=FIGURE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        """Mengembalikan hasil build() yang tersimpan untuk `key`, atau membangun dan menyimpannya."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Dibangun di luar lock agar sesi lain tidak menunggu; bila dua sesi membangun bersamaan,
+        # hasil yang terakhir yang disimpan
+        value = build()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def stats(self):
+        """Ringkasan penggunaan cache untuk menentukan ukuran yang pas."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,113 @@
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Aktifkan untuk semua sesi dengan YDSF_PROFILE=1, atau per sesi dengan ?debug=1 di URL
+PROFILE_ENV_VAR = "YDSF_PROFILE"
+PROFILE_QUERY_PARAM = "debug"
+# Bila diisi path file, log JSON ditulis ke file tersebut (satu baris per rerun); bila kosong ke stderr
+PROFILE_LOG_ENV_VAR = "YDSF_PROFILE_LOG"
+
+logger = logging.getLogger("ydsf.profiling")
+
+
+def _setup_logger():
+    if logger.handlers:
+        return
+    log_path = os.environ.get(PROFILE_LOG_ENV_VAR)
+    handler = logging.FileHandler(log_path) if log_path else logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def env_enabled():
+    return os.environ.get(PROFILE_ENV_VAR, "").lower() in ("1", "true", "yes")
+
+
+def current_rss_mb():
+    """Memori (RSS) proses saat ini dalam MB; memakai puncak RSS bila /proc tidak tersedia."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is None:
+        return float("nan")
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss dalam byte di macOS, dalam KB di Linux
+    return max_rss / 1024 ** 2 if sys.platform == "darwin" else max_rss / 1024
+
+
+class RerunProfiler:
+    """Mencatat durasi setiap bagian skrip, hit/miss cache, dan perubahan memori selama satu rerun.
+
+    Bila tidak aktif, semua method tidak melakukan apa-apa sehingga aman dipanggil di jalur utama.
+    """
+
+    def __init__(self, enabled=False, page=None):
+        self.enabled = enabled
+        self.page = page
+        self.sections = []
+        self.cache_events = {}
+        self._depth = 0
+        if enabled:
+            _setup_logger()
+            self._start = time.perf_counter()
+            self._start_rss = current_rss_mb()
+
+    @contextmanager
+    def section(self, name):
+        """Mengukur durasi blok kode dengan nama `name` (boleh bersarang)."""
+        if not self.enabled:
+            yield
+            return
+        depth = self._depth
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.sections.append({
+                'section': name,
+                'depth': depth,
+                'start_ms': (start - self._start) * 1000,
+                'ms': (time.perf_counter() - start) * 1000,
+            })
+
+    def cache_event(self, cache_name, hit):
+        """Mencatat satu hit/miss untuk cache bernama `cache_name`."""
+        if not self.enabled:
+            return
+        counts = self.cache_events.setdefault(cache_name, {'hit': 0, 'miss': 0})
+        counts['hit' if hit else 'miss'] += 1
+
+    def finish(self, **extra):
+        """Menutup rerun: menghitung total durasi dan perubahan memori lalu menulis satu baris log JSON."""
+        if not self.enabled:
+            return None
+        end_rss = current_rss_mb()
+        record = {
+            'event': 'rerun',
+            'timestamp': time.time(),
+            'page': self.page,
+            'total_ms': (time.perf_counter() - self._start) * 1000,
+            'rss_start_mb': self._start_rss,
+            'rss_end_mb': end_rss,
+            'rss_delta_mb': end_rss - self._start_rss,
+            'sections': self.sections,
+            'cache': self.cache_events,
+            **extra,
+        }
+        logger.info(json.dumps(record, default=str))
+        return record
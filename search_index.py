@@ -0,0 +1,219 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Kolom yang bisa dicari lewat kotak "Pencarian"
+SEARCH_COLUMNS = ['Nama Penerima', 'KTP/SIM']
+
+NGRAM = 3
+# Kueri dengan nilai cocok sebanyak ini atau lebih dipetakan ke baris lewat mask vektor, bukan potongan per nilai
+MASK_MIN_VALUES = 64
+# KTP/SIM dianggap nomor identitas bila (tanpa spasi/titik) berisi minimal 8 digit
+KTP_STRIP = r'[\s.]'
+KTP_PATTERN = r'\d{8,}'
+_EMPTY = np.array([], dtype=np.int64)
+# Jumlah titik kode Unicode, basis untuk mengodekan potongan huruf sebagai bilangan
+_CODE_BASE = 0x110000
+
+
+class SearchIndex:
+    """Indeks trigram untuk pencarian substring (tanpa membedakan huruf besar/kecil) pada beberapa kolom.
+
+    Setiap nilai unik dipecah menjadi trigram; kueri dicocokkan ke nilai unik lewat irisan daftar
+    trigram lalu diverifikasi, kemudian dipetakan ke posisi baris. Kueri 1-2 huruf memakai daftar
+    unigram/bigram sehingga tidak perlu memindai semua nilai. Hasil `search` adalah posisi
+    baris (0..n-1) pada DataFrame yang diindeks.
+    """
+
+    def __init__(self, df, columns=SEARCH_COLUMNS):
+        self.n_rows = len(df)
+        self.columns = [col for col in columns if col in df.columns]
+        columns = self.columns
+        # Segmen tambahan dari append(): (posisi baris awal, SearchIndex)
+        self._segments = []
+
+        # Nilai unik (huruf kecil) dari semua kolom, beserta pasangan (id nilai, posisi baris)
+        text = pd.concat([df[col].astype('string').str.lower() for col in columns], ignore_index=True)
+        rows = np.tile(np.arange(self.n_rows, dtype=np.int64), len(columns))
+        codes, uniques = pd.factorize(text, use_na_sentinel=True)
+        valid = codes >= 0
+        codes, rows = codes[valid], rows[valid]
+        self.values = [str(value) for value in uniques]
+
+        # Posisi baris per nilai unik disimpan berurutan (format CSR): rows[offsets[i]:offsets[i + 1]]
+        order = np.lexsort((rows, codes))
+        self._rows = rows[order]
+        self._codes = codes[order]
+        self._offsets = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(self.values)))])
+
+        # Semua potongan 1..NGRAM huruf: kueri sepanjang itu cukup dicari langsung tanpa verifikasi
+        self._grams = _gram_postings(self.values, NGRAM)
+
+    def append(self, df):
+        """Menambahkan baris baru (posisinya melanjutkan baris lama) tanpa membangun ulang indeks lama."""
+        self._segments.append((self.n_rows, SearchIndex(df, self.columns)))
+        self.n_rows += len(df)
+
+    def _match_values(self, query):
+        if len(query) <= NGRAM:
+            return self._grams.get(query, _EMPTY)
+
+        postings = []
+        for i in range(len(query) - NGRAM + 1):
+            ids = self._grams.get(query[i:i + NGRAM])
+            if ids is None:
+                return []
+            postings.append(ids)
+        postings.sort(key=len)
+        candidates = postings[0]
+        for ids in postings[1:]:
+            candidates = np.intersect1d(candidates, ids, assume_unique=True)
+            if not len(candidates):
+                return []
+        # Trigram yang cocok belum menjamin urutannya; verifikasi pada kandidat saja
+        return [i for i in candidates if query in self.values[i]]
+
+    def _value_rows(self, value_ids):
+        """Posisi baris (terurut, unik) untuk daftar id nilai."""
+        if len(value_ids) < MASK_MIN_VALUES:
+            hits = [self._rows[self._offsets[i]:self._offsets[i + 1]] for i in value_ids]
+            return np.unique(np.concatenate(hits)) if hits else _EMPTY
+        # Banyak nilai cocok (kueri pendek): satu operasi vektor atas semua pasangan (nilai, baris)
+        matched = np.zeros(len(self.values), dtype=bool)
+        matched[value_ids] = True
+        hit = np.zeros(self.n_rows, dtype=bool)
+        hit[self._rows[matched[self._codes]]] = True
+        return np.flatnonzero(hit)
+
+    def search(self, query):
+        """Posisi baris (terurut) yang salah satu kolomnya mengandung `query`."""
+        query = query.lower()
+        if not query:
+            return np.arange(self.n_rows, dtype=np.int64)
+        hits = [self._value_rows(self._match_values(query))]
+        hits += [segment.search(query) + start for start, segment in self._segments]
+        hits = [rows for rows in hits if len(rows)]
+        if not hits:
+            return _EMPTY
+        return hits[0] if len(hits) == 1 else np.unique(np.concatenate(hits))
+
+
+def _gram_postings(values, max_n):
+    """Daftar id nilai (terurut) untuk setiap potongan 1..max_n huruf dari `values`, dihitung dengan operasi vektor.
+
+    Semua nilai digabung menjadi satu larik kode karakter (dipisah '\\0'); potongan n huruf dikodekan sebagai
+    satu bilangan (basis 0x110000, cukup untuk max_n <= 3 dalam int64) lalu pasangan (potongan, id nilai)
+    diurutkan dan dibuang duplikatnya.
+    """
+    if not values:
+        return {}
+    codes = np.frombuffer(('\0'.join(values) + '\0').encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+    lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+    value_ids = np.repeat(np.arange(len(values), dtype=np.int32), lengths + 1)
+    del lengths
+
+    postings = {}
+    for n in range(1, max_n + 1):
+        m = len(codes) - n + 1
+        keys, valid = codes[:m], codes[:m] != 0
+        for k in range(1, n):
+            keys = keys * _CODE_BASE + codes[k:k + m]
+            valid = valid & (codes[k:k + m] != 0)
+        keys, ids = keys[valid], value_ids[:m][valid]
+        del valid
+        order = np.lexsort((ids, keys))
+        keys, ids = keys[order], ids[order]
+        del order
+        first = np.ones(len(keys), dtype=bool)
+        first[1:] = (keys[1:] != keys[:-1]) | (ids[1:] != ids[:-1])
+        keys, ids = keys[first], ids[first]
+        if not len(keys):
+            continue
+        bounds = np.flatnonzero(np.diff(keys)) + 1
+        for key, group in zip(keys[np.r_[0, bounds]].tolist(), np.split(ids, bounds)):
+            postings[''.join(chr(key // _CODE_BASE ** p % _CODE_BASE) for p in range(n - 1, -1, -1))] = group
+    return postings
+
+
+def normalize_ktp(series):
+    """Menyeragamkan KTP/SIM (tanpa spasi/titik); nilai yang bukan nomor identitas dijadikan NA."""
+    ktp = series.astype('string').str.replace(KTP_STRIP, '', regex=True)
+    return ktp.where(ktp.str.fullmatch(KTP_PATTERN).fillna(False))
+
+
+class RecipientIndex:
+    """Indeks hash KTP/SIM dan NIDS atas gabungan semua program, untuk pencarian lintas program.
+
+    Hasil pencarian berupa posisi baris pada DataFrame gabungan (load_all_data).
+    """
+
+    def __init__(self, df):
+        self._ktp = normalize_ktp(df['KTP/SIM']).reset_index(drop=True)
+        self._by_ktp = self._ktp.groupby(self._ktp, sort=False).indices
+        nids = df['NIDS'].reset_index(drop=True)
+        self._by_nids = nids.groupby(nids, sort=False).indices
+        self.duplicates = self._find_duplicates(df, self._ktp)
+
+    def append(self, df, offset):
+        """Mengindeks baris df[offset:] yang baru ditambahkan dan memperbarui penerima ganda yang terdampak."""
+        new = df.iloc[offset:]
+        ktp = normalize_ktp(new['KTP/SIM']).reset_index(drop=True)
+        nids = new['NIDS'].reset_index(drop=True)
+        self._ktp = pd.concat([self._ktp, ktp], ignore_index=True)
+        _merge_positions(self._by_ktp, ktp.groupby(ktp, sort=False).indices, offset)
+        _merge_positions(self._by_nids, nids.groupby(nids, sort=False).indices, offset)
+
+        # Hanya KTP/SIM yang muncul di baris baru yang status gandanya bisa berubah
+        touched = ktp.dropna().unique()
+        if not len(touched):
+            return
+        positions = np.unique(np.concatenate([self._by_ktp[key] for key in touched]))
+        recomputed = self._find_duplicates(df.iloc[positions], self._ktp.iloc[positions])
+        kept = self.duplicates.drop(index=touched, errors='ignore')
+        # Tabel kosong tidak ikut digabung agar tipe kolom tidak berubah menjadi object
+        parts = [part for part in (kept, recomputed) if not part.empty] or [recomputed]
+        self.duplicates = (pd.concat(parts) if len(parts) > 1 else parts[0]).sort_values(
+            ['Jumlah Program', 'Jumlah Transaksi'], ascending=False)
+
+    def lookup(self, query):
+        """Posisi baris (terurut) dengan KTP/SIM atau NIDS yang sama persis dengan `query`."""
+        query = str(query).strip()
+        hits = []
+        ktp = re.sub(KTP_STRIP, '', query)
+        if re.fullmatch(KTP_PATTERN, ktp) and ktp in self._by_ktp:
+            hits.append(self._by_ktp[ktp])
+        # isdecimal, bukan isdigit: karakter seperti "²" lolos isdigit tetapi gagal di int()
+        if query.isdecimal() and int(query) in self._by_nids:
+            hits.append(self._by_nids[int(query)])
+        if not hits:
+            return _EMPTY
+        return np.unique(np.concatenate(hits))
+
+    @staticmethod
+    def _find_duplicates(df, ktp):
+        """Daftar KTP/SIM yang menerima bantuan dari lebih dari satu program."""
+        data = pd.DataFrame({
+            'KTP/SIM': ktp.to_numpy(),
+            'program_nama': df['program_nama'].astype(str).to_numpy(),
+            'Nama Penerima': df['Nama Penerima'].to_numpy(),
+            'Jumlah Bantuan': df['Jumlah Bantuan'].to_numpy(),
+        }).dropna(subset=['KTP/SIM'])
+        n_program = data.groupby('KTP/SIM', sort=False)['program_nama'].nunique()
+        # Tanpa penerima ganda pun hasilnya tetap lewat groupby, agar tipe kolom dan nama indeks (KTP/SIM) sama
+        data = data[data['KTP/SIM'].isin(n_program.index[n_program > 1])]
+        duplicates = data.groupby('KTP/SIM', sort=False).agg(**{
+            'Nama Penerima': ('Nama Penerima', 'first'),
+            'Jumlah Program': ('program_nama', 'nunique'),
+            'Program': ('program_nama', lambda s: ", ".join(sorted(s.unique()))),
+            'Jumlah Transaksi': ('program_nama', 'size'),
+            'Total Bantuan': ('Jumlah Bantuan', 'sum'),
+        })
+        return duplicates.sort_values(['Jumlah Program', 'Jumlah Transaksi'], ascending=False)
+
+
+def _merge_positions(index, new_positions, offset):
+    """Menggabungkan posisi baris baru (digeser sebesar offset) ke indeks hash yang sudah ada."""
+    for key, positions in new_positions.items():
+        positions = positions + offset
+        index[key] = np.concatenate([index[key], positions]) if key in index else positions
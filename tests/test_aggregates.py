@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from aggregates import PROFILE_COLUMNS, ClusterProfile, _median
+
+
+@pytest.mark.parametrize('values', [
+    [5],
+    [1, 2],
+    [3, 1, 2],
+    [7, 7, 7, 1],
+    [10, 20, 20, 30, 30, 30],
+    [0.5, 2.5, 2.5, 100.0, 4.0],
+])
+def test_median_matches_series_median(values):
+    series = pd.Series(values, dtype='float64')
+    assert _median(series.value_counts()) == series.median()
+
+
+def test_median_of_empty_counts_is_nan():
+    assert np.isnan(_median(pd.Series(dtype='int64')))
+
+
+def old_cluster_summary(df_cluster):
+    """generate_cluster_summary_df versi lama: value_counts pada baris satu cluster yang difilter."""
+    kota_dist = df_cluster['Kota'].value_counts(normalize=True).nlargest(2)
+    sub_dist = df_cluster['Kat. Subprogram'].value_counts(normalize=True).nlargest(2)
+    angg_dist = df_cluster['Sumber Anggaran'].value_counts(normalize=True)
+    return pd.DataFrame({
+        "Metrik": ["Median Jumlah Bantuan", "Median Durasi Total", "Kota Dominan (Top 2)", "Subprogram Dominan (Top 2)",
+                   "Sumber Anggaran Dominan"],
+        "Nilai": [f"Rp {df_cluster['Jumlah Bantuan'].median():,.0f}", f"{df_cluster['Durasi Total'].median():.0f} Hari",
+                  ", ".join(f"{idx} ({val:.1%})" for idx, val in kota_dist.items()),
+                  ", ".join(f"{idx} ({val:.1%})" for idx, val in sub_dist.items()),
+                  ", ".join(f"{idx} ({val:.1%})" for idx, val in angg_dist.items())],
+    }).set_index('Metrik')
+
+
+def test_cluster_profile_matches_old_per_cluster_value_counts():
+    # Nilai dengan frekuensi sama muncul tidak urut abjad, sehingga urutan kemunculan pertama ikut teruji
+    df = pd.DataFrame({
+        'Cluster': [0, 0, 0, 0, 1, 1, 0, 1, 0, 0],
+        'Tahun': [2019, 2019, 2020, 2020, 2019, 2019, 2019, 2020, 2020, np.nan],
+        'Kota': ['TUBAN', 'PONOROGO', 'SURABAYA', 'BLITAR', 'MALANG', 'KEDIRI', 'SURABAYA', 'MALANG', 'TUBAN', 'KEDIRI'],
+        'Kat. Subprogram': ['SD', 'SMP', 'SMP', 'SD', 'TK', 'SD', 'TK', 'SD', 'TK', 'SD'],
+        'Sumber Anggaran': ['Zakat', 'Infak', 'Infak', 'Zakat', 'Wakaf', 'Infak', 'Zakat', 'Wakaf', 'Infak', 'Zakat'],
+        'Jumlah Bantuan': [100, 250, 100, 250, 50, 75, 300, 50, 250, 100],
+        'Durasi Total': [3, 7, 7, 3, 14, 14, 1, 2, 7, 3],
+    })
+    # Data di DataStore memakai kolom kategori; kode lama membaca teks biasa dari CSV
+    profile = ClusterProfile(df.astype({col: 'category' for col in ['Kota', 'Kat. Subprogram', 'Sumber Anggaran']}))
+
+    for cluster in [0, 1]:
+        rows = df[df['Cluster'] == cluster]
+        for year in [None, 2019, 2020]:
+            df_cluster = rows if year is None else rows[rows['Tahun'] == year]
+            pd.testing.assert_frame_equal(profile.summary(cluster, year), old_cluster_summary(df_cluster))
+            for col in PROFILE_COLUMNS:
+                old = df_cluster[col].value_counts()
+                new = profile.value_counts(col, cluster, year)
+                assert new.index.astype(object).tolist() == old.index.tolist()
+                assert new.tolist() == old.tolist()
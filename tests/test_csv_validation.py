@@ -0,0 +1,64 @@
+import pandas as pd
+
+from csv_validation import CSV_ENCODING, EXPECTED_COLUMNS, MAX_FIELD_CHARS, read_validated_csv
+
+
+def write_csv(path, rows):
+    lines = [';'.join(EXPECTED_COLUMNS)] + rows
+    path.write_text('\n'.join(lines) + '\n', encoding=CSV_ENCODING)
+
+
+def row(nids, nama='Ahmad'):
+    return f"{nids};3578000000000{nids:03d};{nama};Surabaya;Beasiswa;Infak;100000;7;0;2024"
+
+
+def test_unclosed_quote_only_quarantines_its_own_line(tmp_path):
+    path = tmp_path / 'program_x.csv'
+    write_csv(path, [row(1), row(2, nama='"Siti'), row(3), row(4), row(5)])
+    df, report = read_validated_csv(str(path))
+
+    assert df['NIDS'].tolist() == [1, 3, 4, 5]
+    assert [bad['line'] for bad in report['bad_rows']] == [3]
+    assert 'kutip' in report['bad_rows'][0]['problem']
+    quarantined = pd.read_csv(report['quarantine'], sep=';', encoding=CSV_ENCODING, dtype=str)
+    assert quarantined['Baris File'].tolist() == ['3']
+
+
+def test_overlong_field_is_quarantined(tmp_path):
+    path = tmp_path / 'program_x.csv'
+    write_csv(path, [row(1), row(2, nama='A' * MAX_FIELD_CHARS), row(3)])
+    df, report = read_validated_csv(str(path), quarantine=False)
+
+    assert df['NIDS'].tolist() == [1, 3]
+    assert [bad['line'] for bad in report['bad_rows']] == [3]
+
+
+def test_wrong_column_count_keeps_line_numbers(tmp_path):
+    path = tmp_path / 'program_x.csv'
+    write_csv(path, [row(1), row(2) + ';lebih', '', row(3)[:-4] + 'abcd'])
+    df, report = read_validated_csv(str(path), quarantine=False)
+
+    assert df['NIDS'].tolist() == [1, 3]
+    assert [bad['line'] for bad in report['bad_rows']] == [3]
+    assert report['coercion_failures']['Tahun'] == [(5, 'abcd')]
+
+
+def test_quoted_field_with_line_break_is_accepted(tmp_path):
+    path = tmp_path / 'program_x.csv'
+    write_csv(path, [row(1), row(2, nama='"Siti\nAminah"'), row(3)[:-4] + 'abcd', row(4)])
+    df, report = read_validated_csv(str(path), quarantine=False)
+
+    assert df['NIDS'].tolist() == [1, 2, 3, 4]
+    assert df['Nama Penerima'][1] == 'Siti\nAminah'
+    assert report['bad_rows'] == []
+    # Record kedua memakai baris 3-4, sehingga record ketiga ada di baris 5
+    assert report['coercion_failures']['Tahun'] == [(5, 'abcd')]
+
+
+def test_unclosed_quote_after_line_break_record_keeps_line_numbers(tmp_path):
+    path = tmp_path / 'program_x.csv'
+    write_csv(path, [row(1, nama='"Siti\nAminah"'), row(2, nama='"Budi'), row(3), row(4)])
+    df, report = read_validated_csv(str(path), quarantine=False)
+
+    assert df['NIDS'].tolist() == [1, 3, 4]
+    assert [bad['line'] for bad in report['bad_rows']] == [4]
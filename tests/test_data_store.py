@@ -0,0 +1,206 @@
+import os
+import threading
+
+import pandas as pd
+
+import data_store
+from aggregates import CUBE_COLUMNS
+from csv_validation import CSV_ENCODING, EXPECTED_COLUMNS
+from data_store import DataStore
+
+
+def row(nids, cluster=0, tahun=2024, kota='Surabaya'):
+    return f"{nids};3578000000{nids:06d};Penerima {nids};{kota};Beasiswa;Infak;{nids * 1000};{nids % 30};{cluster};{tahun}"
+
+
+def write_program(path, rows, mtime_ns=None):
+    path.write_text('\n'.join([';'.join(EXPECTED_COLUMNS)] + rows) + '\n', encoding=CSV_ENCODING)
+    if mtime_ns is not None:
+        # Beberapa filesystem hanya menyimpan mtime per detik: pastikan penggantian file terdeteksi
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def make_files(tmp_path, sizes=None):
+    sizes = sizes or {'Dakwah': 40, 'Yatim': 30}
+    data_files = {}
+    for program, size in sizes.items():
+        path = tmp_path / f"program_{program.lower()}.csv"
+        write_program(path, [row(i, cluster=i % 3, tahun=2020 + i % 4) for i in range(1, size + 1)])
+        data_files[program] = str(path)
+    return data_files
+
+
+def test_load_all_resets_state_of_replaced_file(tmp_path):
+    data_files = make_files(tmp_path)
+    store = DataStore(data_files)
+    store.cube()
+    assert len(store.cluster_profile('Yatim').rows(0)) == 10
+
+    path = tmp_path / 'program_yatim.csv'
+    write_program(path, [row(i, cluster=1) for i in range(1, 6)], mtime_ns=os.stat(path).st_mtime_ns + 10 ** 9)
+    store.load_all(max_workers=2)
+
+    assert store.version == 1
+    assert len(store.get('Yatim')) == 5
+    profile = store.cluster_profile('Yatim')
+    assert len(profile.rows(0)) == 0
+    assert len(store.get('Yatim').iloc[profile.rows(1)]) == 5
+    pd.testing.assert_frame_equal(store.cube(), DataStore(data_files).cube())
+
+
+def test_cube_of_all_programs_loads_cube_columns_in_parallel(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_store, 'LOAD_WORKERS', 2)
+    loads = []
+    original_load = DataStore._load
+
+    def recording_load(self, program_name, columns=None):
+        loads.append((program_name, columns, threading.current_thread() is threading.main_thread()))
+        return original_load(self, program_name, columns)
+
+    monkeypatch.setattr(DataStore, '_load', recording_load)
+    data_files = make_files(tmp_path)
+    cube = DataStore(data_files).cube()
+
+    assert sorted(program for program, _, _ in loads) == ['Dakwah', 'Yatim']
+    assert all(columns == CUBE_COLUMNS and not on_main for _, columns, on_main in loads)
+    assert cube['jumlah'].sum() == 70
+
+
+def test_build_caches_converts_stale_files_in_other_processes(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_store, 'PROCESS_CONVERT_MIN_BYTES', 0)
+    data_files = make_files(tmp_path)
+    assert all(data_store._needs_cache(path) for path in data_files.values())
+    data_store.build_caches(data_files.values(), max_workers=2)
+
+    assert not any(data_store._needs_cache(path) for path in data_files.values())
+    pd.testing.assert_frame_equal(data_store.load_program_frame(data_files['Yatim']),
+                                  data_store.read_program_file(data_files['Yatim']))
+
+
+def write_delta(tmp_path, program, period, rows):
+    delta_dir = tmp_path / 'delta'
+    delta_dir.mkdir(exist_ok=True)
+    write_program(delta_dir / f"program_{program.lower()}_{period}.csv", rows)
+
+
+# Baris tambahan: penerima lama (KTP/SIM ganda), penerima baru, kota baru (kategori baru) dan tahun baru
+DELTA_ROWS = [row(5, cluster=2, tahun=2025), row(101, cluster=1, tahun=2023, kota='KAB. GRESIK'), row(102)]
+
+
+def build_everything(store, program):
+    """Membangun semua turunan yang diperbarui refresh(), seperti setelah semua halaman dashboard dibuka."""
+    store.combined()
+    store.cube()
+    store.cube(program)
+    store.cluster_profile(program)
+    store.search_index(program)
+    store.recipient_index()
+    store.sort_order(program, 'Nama Penerima')
+
+
+def sorted_cube(cube):
+    keys = [col for col in cube.columns if col in ('program_nama', 'Tahun', 'Kota', 'Kat. Subprogram',
+                                                   'Sumber Anggaran', 'Cluster')]
+    cube = cube.astype({col: str for col in keys})
+    return cube.sort_values(keys).reset_index(drop=True)
+
+
+def assert_same_as_fresh(store, data_files, program):
+    """Semua struktur turunan `store` sama dengan DataStore baru yang memuat file yang sama dari awal."""
+    fresh = DataStore(data_files)
+    # Sesudah gabungan dibentuk, data per program adalah potongan gabungan (tipe kolom mengikuti gabungan)
+    build_everything(store, program)
+    build_everything(fresh, program)
+
+    pd.testing.assert_frame_equal(store.get(program), fresh.get(program))
+    # Baris baru ditaruh di akhir gabungan, sehingga gabungan dibandingkan per program
+    combined, fresh_combined = store.combined(), fresh.combined()
+    for name in data_files:
+        pd.testing.assert_frame_equal(
+            combined[combined['program_nama'] == name].reset_index(drop=True),
+            fresh_combined[fresh_combined['program_nama'] == name].reset_index(drop=True))
+    pd.testing.assert_frame_equal(sorted_cube(store.cube()), sorted_cube(fresh.cube()))
+    pd.testing.assert_frame_equal(sorted_cube(store.cube(program)), sorted_cube(fresh.cube(program)))
+
+    profile, fresh_profile = store.cluster_profile(program), fresh.cluster_profile(program)
+    assert profile.clusters == fresh_profile.clusters and profile.years == fresh_profile.years
+    for cluster in fresh_profile.clusters:
+        for year in [None] + fresh_profile.years:
+            pd.testing.assert_frame_equal(profile.summary(cluster, year), fresh_profile.summary(cluster, year))
+            assert list(profile.rows(cluster, year)) == list(fresh_profile.rows(cluster, year))
+
+    for query in ['penerima 1', 'penerima 10', '3578', 'x']:
+        assert sorted(store.search_index(program).search(query)) == sorted(fresh.search_index(program).search(query))
+    assert list(store.sort_order(program, 'Nama Penerima')) == list(fresh.sort_order(program, 'Nama Penerima'))
+
+    index, fresh_index = store.recipient_index(), fresh.recipient_index()
+    pd.testing.assert_frame_equal(index.duplicates.sort_index(), fresh_index.duplicates.sort_index())
+    for query in ['3578000000000005', '3578000000000101', '5', '101']:
+        found = combined.iloc[index.lookup(query)][['program_nama', 'NIDS', 'Tahun']]
+        expected = fresh_combined.iloc[fresh_index.lookup(query)][['program_nama', 'NIDS', 'Tahun']]
+        assert sorted(map(tuple, found.astype(str).to_numpy())) == sorted(map(tuple, expected.astype(str).to_numpy()))
+
+
+def test_refresh_appends_delta_like_a_fresh_load(tmp_path):
+    data_files = make_files(tmp_path)
+    store = DataStore(data_files)
+    build_everything(store, 'Yatim')
+
+    write_delta(tmp_path, 'Yatim', '2025-09', DELTA_ROWS)
+    assert store.refresh(force=True) == ['Yatim']
+    assert store.version == 1
+    assert store.refresh(force=True) == []
+    assert_same_as_fresh(store, data_files, 'Yatim')
+
+
+def test_full_load_reuses_deltas_of_partial_load(tmp_path):
+    data_files = make_files(tmp_path)
+    write_delta(tmp_path, 'Yatim', '2025-08', DELTA_ROWS[:1])
+    store = DataStore(data_files)
+    cube = store.cube('Yatim')
+
+    # Delta yang muncul sesudah kubus dibangun baru dimuat lewat refresh(), agar data dan kubus tetap sejalan
+    write_delta(tmp_path, 'Yatim', '2025-09', DELTA_ROWS[1:])
+    assert len(store.get('Yatim')) == cube['jumlah'].sum() == 31
+    assert store.refresh(force=True) == ['Yatim']
+    assert len(store.get('Yatim')) == 33
+    assert_same_as_fresh(store, data_files, 'Yatim')
+
+
+def test_refresh_reloads_partial_program_with_new_delta(tmp_path):
+    data_files = make_files(tmp_path)
+    store = DataStore(data_files)
+    store.cube()
+
+    write_delta(tmp_path, 'Yatim', '2025-09', DELTA_ROWS)
+    assert store.refresh(force=True) == ['Yatim']
+    assert store.cube('Yatim')['jumlah'].sum() == 33
+    assert_same_as_fresh(store, data_files, 'Yatim')
+
+
+def test_refresh_resets_replaced_file(tmp_path):
+    data_files = make_files(tmp_path)
+    store = DataStore(data_files)
+    build_everything(store, 'Yatim')
+
+    path = tmp_path / 'program_yatim.csv'
+    write_program(path, [row(i, cluster=i % 2, tahun=2021) for i in range(1, 12)],
+                  mtime_ns=os.stat(path).st_mtime_ns + 10 ** 9)
+    assert store.refresh(force=True) == ['Yatim']
+    assert not store.is_loaded() and not store.is_loaded('Yatim')
+    assert_same_as_fresh(store, data_files, 'Yatim')
+
+
+def test_broken_delta_is_skipped_until_fixed(tmp_path):
+    data_files = make_files(tmp_path)
+    store = DataStore(data_files)
+    build_everything(store, 'Yatim')
+
+    broken = tmp_path / 'delta' / 'program_yatim_2025-09.csv'
+    broken.parent.mkdir()
+    broken.write_text('NIDS;Nama Penerima\n1;Ahmad\n', encoding=CSV_ENCODING)
+    assert store.refresh(force=True) == []
+
+    write_delta(tmp_path, 'Yatim', '2025-09', DELTA_ROWS)
+    assert store.refresh(force=True) == ['Yatim']
+    assert_same_as_fresh(store, data_files, 'Yatim')
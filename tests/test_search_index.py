@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from search_index import RecipientIndex, SearchIndex
+
+
+def make_frame(rows):
+    """DataFrame gabungan kecil dengan tipe kolom seperti hasil DataStore.combined()."""
+    nids, ktp, nama, bantuan, program = zip(*rows)
+    return pd.DataFrame({
+        'NIDS': np.array(nids, dtype='int64'),
+        'KTP/SIM': pd.array(ktp, dtype='string'),
+        'Nama Penerima': pd.array(nama, dtype='string'),
+        'Jumlah Bantuan': np.array(bantuan, dtype='int64'),
+        'program_nama': pd.Categorical(program, categories=['Dakwah', 'Yatim', 'Zakat']),
+    })
+
+
+BASE = [
+    (1, '3578000000000001', 'Ahmad', 100, 'Dakwah'),
+    (2, '3578000000000001', 'Ahmad', 200, 'Yatim'),
+    (3, '3578000000000002', 'Siti', 300, 'Zakat'),
+    (4, 'tanpa ktp', 'Budi', 400, 'Dakwah'),
+]
+DELTAS = {
+    'bukan_ganda': [(5, '3578000000000009', 'Rina', 50, 'Zakat'), (6, 'tanpa ktp', 'Dewi', 60, 'Yatim')],
+    'ganda_baru': [(5, '3578 0000 0000 0002', 'Siti', 70, 'Dakwah')],
+    'ganda_lama': [(5, '3578000000000001', 'Ahmad', 80, 'Zakat')],
+    'tanpa_ktp': [(5, 'tanpa ktp', 'Eko', 90, 'Zakat')],
+}
+
+
+def assert_same_duplicates(actual, expected):
+    # Urutan baris dengan Jumlah Program/Transaksi sama tidak ditentukan; bandingkan per KTP/SIM
+    pd.testing.assert_frame_equal(actual.sort_index(), expected.sort_index())
+
+
+@pytest.mark.parametrize('delta', DELTAS.values(), ids=DELTAS.keys())
+def test_append_matches_rebuild(delta):
+    base, combined = make_frame(BASE), make_frame(BASE + delta)
+    index = RecipientIndex(base)
+    index.append(combined, len(base))
+    expected = RecipientIndex(combined)
+
+    assert_same_duplicates(index.duplicates, expected.duplicates)
+    assert index.duplicates.index.name == 'KTP/SIM'
+    for query in ['3578000000000001', '3578000000000002', '3578000000000009', '5', '1']:
+        np.testing.assert_array_equal(index.lookup(query), expected.lookup(query))
+
+
+def test_append_keeps_types_without_duplicates():
+    base = make_frame(BASE[2:])
+    index = RecipientIndex(base)
+    assert index.duplicates.empty
+    combined = make_frame(BASE[2:] + DELTAS['bukan_ganda'])
+    index.append(combined, len(base))
+
+    expected = RecipientIndex(combined).duplicates
+    assert index.duplicates.index.name == 'KTP/SIM'
+    pd.testing.assert_series_equal(index.duplicates.dtypes, expected.dtypes)
+
+
+@pytest.mark.parametrize('query', ['', 'a', 'AH', 'ma', 'mad', 'ahmad', '3578', '0001', ' ', 'zz', 'siti r'])
+def test_search_matches_substring_scan(query):
+    df = pd.DataFrame({
+        'Nama Penerima': pd.array(['Ahmad', 'Siti Rahma', None, 'Muhammad', 'Ma', 'A'], dtype='string'),
+        'KTP/SIM': pd.array(['3578000000000001', 'tanpa ktp', '3578000000000002', None, '0001', '3578'], dtype='string'),
+    })
+    index = SearchIndex(df.iloc[:4])
+    index.append(df.iloc[4:].reset_index(drop=True))
+
+    text = df.apply(lambda col: col.str.lower().fillna(''))
+    expected = np.flatnonzero(text.apply(lambda col: col.str.contains(query.lower(), regex=False)).any(axis=1))
+    np.testing.assert_array_equal(index.search(query), expected)
+
+
+@pytest.mark.parametrize('query', ['²', '3²', '½'])
+def test_lookup_ignores_non_decimal_digits(query):
+    index = RecipientIndex(make_frame(BASE))
+    assert len(index.lookup(query)) == 0